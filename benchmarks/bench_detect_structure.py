@@ -0,0 +1,133 @@
+"""
+Microbenchmark da classificação de blocos em detect_structure.
+
+Compara a implementação original (re.match com padrões não compilados, um por regra)
+com a tabela de regras compilada numa única regex, sobre os blocos extraídos de um PDF
+de data/input (por padrão o REGIMENTO_GERAL_FEVEREIRO_DE_2025.pdf), verificando que a
+saída é idêntica e mostrando os contadores por regra.
+
+Confere também o índice de citações na página com mais artigos do PDF: cada rótulo
+"Art. N" da página precisa virar um artigo próprio no índice, e nenhum artigo resolvido
+pode conter o texto de outro artigo.
+
+Uso:
+    python benchmarks/bench_detect_structure.py [--pdf REGIMENTO_GERAL_FEVEREIRO_DE_2025.pdf] [--backend pymupdf] [--repeat 20]
+"""
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'src'))
+
+from extract_raw import extract_raw
+from detect_structure import detect_structure, split_block_text
+from citation_index import CitationIndex, citation_key, other_article_labels
+
+
+def detect_structure_reference(text_blocks: list[dict]) -> list:
+    """
+    Laço original de detect_structure (apenas "estrutura"), mantido aqui como referência
+    (com a divisão dos blocos por split_block_text e os padrões atuais de rótulo).
+    """
+    estrutura = []
+    current_article = None
+    segments = [(segment, block["page"]) for block in text_blocks for segment in split_block_text(block["text"])]
+    for segment, page_num in segments:
+        line = segment.strip()
+        if not line:
+            continue
+        match_artigo = re.match(r"^(art\.?\s*\d+(?:-[a-z]\b)?[º°]?)\.?(.*)", line, re.IGNORECASE)
+        if match_artigo:
+            new_article = {"tipo": "artigo", "titulo": match_artigo.group(1).capitalize(), "paragrafos": []}
+            artigo_texto = match_artigo.group(2).strip()
+            if artigo_texto:
+                new_article["paragrafos"].append({"numero": None, "texto": artigo_texto, "pagina": page_num})
+            estrutura.append(new_article)
+            current_article = new_article
+            continue
+        match_paragrafo = re.match(r"^(§\s*\d+[º°]?|parágrafo único|\b[ivxlcdm]+\s*[-–—])\.?\s*(.*)", line, re.IGNORECASE)
+        if match_paragrafo:
+            paragraph = {"numero": match_paragrafo.group(1).strip(), "texto": match_paragrafo.group(2).strip(), "pagina": page_num}
+            if current_article:
+                current_article["paragrafos"].append(paragraph)
+            else:
+                estrutura.append({"tipo": "paragrafo", "titulo": None, **paragraph})
+            continue
+        if current_article:
+            current_article["paragrafos"].append({"numero": None, "texto": line, "pagina": page_num})
+        else:
+            estrutura.append({"tipo": "paragrafo", "titulo": None, "numero": None, "texto": line, "pagina": page_num})
+    return estrutura
+
+
+def check_citation_page(blocks: list[dict]) -> bool:
+    """
+    Monta o índice de citações só com os blocos da página com mais rótulos "Art. N" e
+    confere que todos viram artigos do índice e que nenhum artigo resolvido engloba outro.
+    """
+    def page_labels(page_num):
+        return {citation_key(label) for block in blocks if block["page"] == page_num
+                for label in re.findall(r"\bArt\.?\s*\d+(?:-[A-Z]\b)?", block["text"])}
+
+    page_num = max({block["page"] for block in blocks}, key=lambda page: len(page_labels(page)))
+    expected = page_labels(page_num)
+    page_blocks = [block for block in blocks if block["page"] == page_num]
+    estrutura = detect_structure("", page_blocks)["estrutura"]
+    index = CitationIndex.from_estrutura(estrutura)
+
+    missing = sorted(expected - set(index.artigos))
+    mixed = []
+    for key in index.artigos:
+        article = index.resolve(estrutura, key)
+        texto = " ".join(paragrafo["texto"] for paragrafo in article["paragrafos"])
+        if other_article_labels(texto, key):
+            mixed.append(key)
+    ok = not missing and not mixed
+    print(f"  índice de citações, página {page_num}: {len(index.artigos)}/{len(expected)} artigos"
+          + (f" | faltando: {missing}" if missing else "")
+          + (f" | com outros artigos no texto: {mixed}" if mixed else "")
+          + f" | ok: {ok}")
+    return ok
+
+
+def _best_of(func, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", default="REGIMENTO_GERAL_FEVEREIRO_DE_2025.pdf", help="PDF em data/input")
+    parser.add_argument("--backend", default="pymupdf", help="backend de extração dos blocos")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pdf_path = ROOT / 'data' / 'input' / args.pdf
+    blocks = extract_raw(str(pdf_path), backend=args.backend)
+    if not blocks:
+        print(f"Nenhum bloco extraído de '{pdf_path}'.")
+        return 1
+
+    t_ref, expected = _best_of(lambda: detect_structure_reference(blocks), args.repeat)
+    stats = {}
+    t_new, structure = _best_of(lambda: detect_structure(str(pdf_path), blocks, stats=stats), args.repeat)
+    identical = structure["estrutura"] == expected
+
+    print(f"{args.pdf}: {len(blocks)} blocos")
+    print(f"  re.match por regra: {t_ref * 1000:8.2f}ms ({len(blocks) / t_ref:12,.0f} blocos/s)")
+    print(f"  regex compilada   : {t_new * 1000:8.2f}ms ({len(blocks) / t_new:12,.0f} blocos/s)")
+    print(f"  speedup: {t_ref / t_new:6.2f}x | saída idêntica: {identical}")
+    print("  regras: " + ", ".join(f"{name}={hits}" for name, hits in stats["rule_hits"].items()))
+    citations_ok = check_citation_page(blocks)
+    return 0 if identical and citations_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Benchmark da pré-triagem de páginas do extract_tables.
+
+Compara a extração original (camelot.read_pdf com pages='all' nos flavors lattice e stream)
+com extract_tables(prescreen=True), que roda cada flavor só nas páginas candidatas de
+prescreen_pages. Verifica que nenhuma página em que o lattice encontrou tabela ficou fora
+da triagem (sai com código 1 se ficou) e mostra as páginas puladas por flavor.
+Com --workers > 1, o Camelot roda em blocos de --chunk-size páginas num pool de processos.
+
+Uso:
+    python benchmarks/bench_extract_tables.py [--pdf REGIMENTO_GERAL_FEVEREIRO_DE_2025.pdf] [--all] [--workers 4] [--chunk-size 4]
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import camelot
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'src'))
+
+from extract_tables import extract_tables, prescreen_pages, FLAVORS
+
+
+def _keep(rows: list) -> bool:
+    return len(rows) > 1 and any(cell.strip() for row in rows for cell in row)
+
+
+def extract_reference(pdf_path: str) -> tuple[float, set]:
+    """Extração original (pages='all'), mantida aqui como referência: (tempo, páginas com tabela lattice)."""
+    lattice_pages = set()
+    t0 = time.perf_counter()
+    for flavor in FLAVORS:
+        try:
+            tables = camelot.read_pdf(pdf_path, pages='all', flavor=flavor, suppress_stdout=True)
+        except Exception as e:
+            print(f"  Aviso: referência com flavor='{flavor}' falhou: {e}")
+            continue
+        if flavor == "lattice":
+            lattice_pages.update(int(t.page) for t in tables if _keep(t.df.values.tolist()))
+    return time.perf_counter() - t0, lattice_pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", default="REGIMENTO_GERAL_FEVEREIRO_DE_2025.pdf", help="PDF em data/input")
+    parser.add_argument("--all", action="store_true", help="todos os PDFs de data/input (lento)")
+    parser.add_argument("--workers", type=int, default=1, help="processos do Camelot")
+    parser.add_argument("--chunk-size", type=int, default=4, help="páginas por bloco enviado a cada worker")
+    args = parser.parse_args()
+
+    input_dir = ROOT / 'data' / 'input'
+    pdfs = sorted(input_dir.glob('*.pdf')) if args.all else [input_dir / args.pdf]
+
+    ok, t_ref_total, t_new_total = True, 0.0, 0.0
+    for pdf_path in pdfs:
+        print(f"{pdf_path.name}:")
+        t_ref, lattice_pages = extract_reference(str(pdf_path))
+        stats = {}
+        t0 = time.perf_counter()
+        tables = extract_tables(str(pdf_path), workers=args.workers, chunk_size=args.chunk_size, stats=stats)
+        t_new = time.perf_counter() - t0
+        missed = sorted(lattice_pages - set(prescreen_pages(str(pdf_path))["lattice"]))
+        ok = ok and not missed
+        t_ref_total += t_ref
+        t_new_total += t_new
+
+        print(f"  pages='all'   : {t_ref:8.1f}s")
+        print(f"  pré-triagem   : {t_new:8.1f}s (workers={args.workers}) ({len(tables)} tabelas) | speedup: {t_ref / t_new:6.1f}x")
+        for flavor in FLAVORS:
+            flavor_stats = stats["flavors"][flavor]
+            print(f"    {flavor:7}: {flavor_stats['pages']}/{stats['n_pages']} páginas, "
+                  f"{flavor_stats['skipped']} puladas, {flavor_stats['seconds']:.1f}s")
+        dedup = stats["dedup"]
+        print(f"    dedup  : {dedup['exact']} idênticas, {dedup['overlap']} sobrepostas "
+              f"({dedup['replaced']} trocadas pela detecção stream)")
+        print(f"  páginas com tabela lattice fora da triagem: {missed or 'nenhuma'}")
+
+    if len(pdfs) > 1:
+        print(f"Total: {t_ref_total:.1f}s -> {t_new_total:.1f}s ({t_ref_total / t_new_total:.1f}x)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Microbenchmark do parser de horários do table_pipeline (processors/horario.py).
+
+Compara a versão original de _process_horario_df (cabeçalho com iterrows, apply de
+_parse_cell_content célula a célula compilando os padrões de sala a cada chamada e sala
+padrão preenchida num laço sobre os dicts) com a versão atual (padrões pré-compilados e
+fundidos, células memoizadas, sala padrão por máscara), sobre as tabelas das páginas de
+horário do PDF. Confere que os dicts de "horario" são idênticos (sai com código 1 se não).
+
+Uso:
+    python benchmarks/bench_horario.py [--pdf Ciencia-da-computacao-01-2025_com_sala_MkIII.pdf] [--repeat 20]
+"""
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'src'))
+
+from table_pipeline.context import DocumentContext
+from table_pipeline.identifier import identify_page_type
+from table_pipeline.processors import horario
+from table_pipeline.processors.horario import _process_horario_df, _extract_horario_metadata, _get_default_room
+
+
+def _parse_cell_content_reference(cell_text: str) -> dict:
+    """_parse_cell_content original, mantida aqui como referência."""
+    aula = {"disciplina": None, "professor": None, "sala": None}
+    if pd.isna(cell_text) or not str(cell_text).strip():
+        return aula
+
+    text = ' '.join(str(cell_text).strip().split())
+    professor = None
+    sala = None
+    disciplina = text
+
+    prof_match = re.search(r"\(([^)]+)\)", disciplina)
+    if prof_match:
+        professor = prof_match.group(1).strip()
+        disciplina = (disciplina[:prof_match.start()] + disciplina[prof_match.end():]).strip()
+
+    sala_patterns_ordered = [
+        r"(?i)(P\d\s*[-–—]?\s*Sala\s*\d+)",
+        r"(?i)(LabCC\s*[-–—]?\s*P\d)",
+        r"(?i)(LabRedes\s*[-–—]?\s*P\d)",
+        r"(?i)(Sala\s*\d+)",
+        r"(?i)(LabCC)",
+        r"(?i)(LabRedes)"
+    ]
+    for pattern in sala_patterns_ordered:
+        matches = list(re.finditer(pattern, disciplina))
+        if matches:
+            last_match = matches[-1]
+            if last_match.end() >= len(disciplina) - 1:
+                sala = ' '.join(last_match.group(1).split())
+                disciplina = disciplina[:last_match.start()].strip()
+                break
+
+    disciplina = disciplina.strip(' -')
+    aula["disciplina"] = disciplina if disciplina else None
+    aula["professor"] = professor
+    aula["sala"] = sala
+    return aula
+
+
+def _process_horario_df_reference(raw_df: pd.DataFrame, default_room: str = None):
+    """_process_horario_df original + preenchimento da sala padrão, mantidos aqui como referência."""
+    if raw_df.empty:
+        return None
+
+    df = raw_df.copy()
+    df.replace(r'^\s*$', pd.NA, regex=True, inplace=True)
+
+    header_row_index = -1
+    dias_semana_keywords = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta"]
+    for i, row in df.iterrows():
+        row_str = ' '.join(row.dropna().astype(str))
+        if any(dia in row_str for dia in dias_semana_keywords):
+            header_row_index = i
+            break
+    if header_row_index == -1:
+        if df.iloc[0].dropna().count() >= 3:
+            header_row_index = 0
+        else:
+            return None
+
+    df.columns = df.iloc[header_row_index]
+    df = df.iloc[header_row_index + 1:].reset_index(drop=True)
+    if df.columns[0] is pd.NA or str(df.columns[0]).strip() == "":
+        df.rename(columns={df.columns[0]: "HorarioInfo"}, inplace=True)
+    df.dropna(axis=1, how='all', inplace=True)
+
+    day_columns = [col for col in df.columns if isinstance(col, str) and any(kw in col for kw in dias_semana_keywords)]
+    df[day_columns] = df[day_columns].ffill()
+    df.dropna(subset=day_columns, how='all', inplace=True)
+    for day_col in day_columns:
+        if day_col in df.columns:
+            df[day_col] = df[day_col].apply(_parse_cell_content_reference)
+
+    def check_row_fully_parsed_empty(row):
+        for day in day_columns:
+            if day in row.index and isinstance(row[day], dict) and row[day].get("disciplina"):
+                return False
+        return True
+    df = df[~df.apply(check_row_fully_parsed_empty, axis=1)].reset_index(drop=True)
+
+    records = df.values.tolist()
+    if default_room:
+        for row in records:
+            for value in row:
+                if isinstance(value, dict) and value.get("disciplina") and value.get("sala") is None:
+                    value["sala"] = default_room
+    return records
+
+
+def _process_current(raw_df: pd.DataFrame, default_room: str = None):
+    df = _process_horario_df(raw_df, default_room)
+    return None if df is None else df.values.tolist()
+
+
+def _best_of(func, inputs: list, repeat: int, clear_cache: bool = False):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        if clear_cache:
+            horario._parse_cell_text.cache_clear()
+        t0 = time.perf_counter()
+        result = [func(raw_df, default_room) for raw_df, default_room in inputs]
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", default="Ciencia-da-computacao-01-2025_com_sala_MkIII.pdf", help="PDF em data/input")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    inputs = []
+    with DocumentContext(str(ROOT / 'data' / 'input' / args.pdf)) as context:
+        pages = [page_num for page_num in range(1, context.page_count + 1)
+                 if identify_page_type(text=context.page_text(page_num), page_num=page_num) == "horario"]
+        context.extract_tables(pages)
+        for page_num in pages:
+            tables = context.tables(page_num)
+            if tables:
+                metadata = _extract_horario_metadata(context.page_text(page_num))
+                inputs.append((tables[0], _get_default_room(metadata.get("salas_info"))))
+    if not inputs:
+        print("Nenhuma tabela de horário encontrada.")
+        return 1
+
+    t_ref, expected = _best_of(_process_horario_df_reference, inputs, args.repeat)
+    t_cold, result_cold = _best_of(_process_current, inputs, args.repeat, clear_cache=True)
+    t_warm, result = _best_of(_process_current, inputs, args.repeat)
+    identical = result == expected and result_cold == expected
+    cells = sum(len(raw_df) * raw_df.shape[1] for raw_df, _ in inputs)
+
+    print(f"Tabelas de horário: {len(inputs)} | células: {cells}")
+    print(f"  original               : {t_ref * 1000:8.2f}ms")
+    print(f"  atual (memo vazio)     : {t_cold * 1000:8.2f}ms | speedup: {t_ref / t_cold:5.2f}x")
+    print(f"  atual (memo aquecido)  : {t_warm * 1000:8.2f}ms | speedup: {t_ref / t_warm:5.2f}x")
+    print(f"  memo: {horario._parse_cell_text.cache_info()}")
+    print(f"  horários idênticos: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
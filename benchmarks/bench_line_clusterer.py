@@ -0,0 +1,92 @@
+"""
+Microbenchmark do agrupamento de words em linhas (fallback de extract_raw).
+
+Compara a implementação linear original (cada word contra todas as linhas já criadas)
+com _cluster_words_into_lines em páginas sintéticas densas, verificando que a saída é idêntica.
+
+Uso:
+    python benchmarks/bench_line_clusterer.py [--words 5000] [--pages 5] [--seed 42]
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src'))
+
+from extract_raw import _cluster_words_into_lines
+
+
+def _cluster_words_linear(words, y_tol=3):
+    """Implementação original O(words × linhas), mantida aqui como referência."""
+    lines_map = []
+    for w in words:
+        y = float(w.get("top") or w.get("doctop") or 0)
+        x = float(w.get("x0") or 0)
+        text = w.get("text", "")
+        placed = False
+        for y_ref, items in lines_map:
+            if abs(y_ref - y) <= y_tol:
+                items.append((x, text))
+                placed = True
+                break
+        if not placed:
+            lines_map.append((y, [(x, text)]))
+    lines_map.sort(key=lambda p: p[0])
+    lines = []
+    for _, items in lines_map:
+        items.sort(key=lambda it: it[0])
+        line = " ".join(t for _, t in items).strip()
+        if line:
+            lines.append(line)
+    return lines
+
+
+def make_synthetic_page(n_words: int, rng: random.Random) -> list[dict]:
+    """
+    Gera uma página sintética 'tabelada': muitas linhas finas (fonte pequena), com jitter
+    vertical nas words e ordem de leitura embaralhada por colunas, como em páginas de PPC.
+    """
+    words_per_line = 12
+    n_lines = max(1, n_words // words_per_line)
+    line_gap = 4.5  # > y_tol, mas com jitter as linhas se aproximam
+    words = []
+    for i in range(n_words):
+        line = i % n_lines
+        col = i // n_lines
+        top = 20 + line * line_gap + rng.uniform(-1.0, 1.0)
+        x0 = 10 + col * 45 + rng.uniform(0, 5)
+        words.append({"text": f"w{line}_{col}", "top": top, "x0": x0})
+    return words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [make_synthetic_page(args.words, rng) for _ in range(args.pages)]
+
+    t0 = time.perf_counter()
+    expected = [_cluster_words_linear(p) for p in pages]
+    t_linear = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = [_cluster_words_into_lines(p) for p in pages]
+    t_sorted = time.perf_counter() - t0
+
+    identical = result == expected
+    total_words = args.words * args.pages
+    print(f"Páginas: {args.pages} x {args.words} words | linhas/página: {len(expected[0])}")
+    print(f"  linear : {t_linear:8.3f}s ({total_words / t_linear:12,.0f} words/s)")
+    print(f"  bisect : {t_sorted:8.3f}s ({total_words / t_sorted:12,.0f} words/s)")
+    print(f"  speedup: {t_linear / t_sorted:8.1f}x | saída idêntica: {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
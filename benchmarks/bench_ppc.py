@@ -0,0 +1,350 @@
+"""
+Benchmark dos parsers de tabela do PPC (processors/ppc.py) sobre o PPCBCC2019.pdf.
+
+Compara as versões originais de _parse_matriz_curricular, _parse_optativas e _parse_docentes
+(cabeçalho com iterrows e apply(_clean_string) coluna a coluna) com as atuais (todas as
+células limpas numa passada sobre a matriz do NumPy e cabeçalho buscado na primeira coluna já
+limpa), rodando parse_ppc_page em todas as páginas de PPC com as tabelas já extraídas.
+Confere que os parsed_data_list são idênticos (sai com código 1 se não forem).
+
+Uso:
+    python benchmarks/bench_ppc.py [--pdf PPCBCC2019.pdf] [--repeat 10]
+"""
+import io
+import sys
+import json
+import time
+import argparse
+import contextlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'src'))
+
+from table_pipeline.context import DocumentContext
+from table_pipeline.identifier import identify_page_type
+from table_pipeline.processors import ppc
+
+PARSERS = ("_parse_matriz_curricular", "_parse_optativas", "_parse_docentes")
+
+
+def _clean_string_reference(text: Any) -> Optional[str]:
+    """_clean_string original, mantida aqui como referência."""
+    if text is None or pd.isna(text):
+        return None
+        
+    cleaned = str(text).replace('\n', ' ').strip()
+    cleaned = ' '.join(cleaned.split()) # Remove espaços duplicados
+    
+    # CORREÇÃO: Se a string estiver vazia (""), retorne "", não None.
+    return cleaned
+
+
+def _parse_matriz_curricular_reference(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """_parse_matriz_curricular original (iterrows + apply(_clean_string) por coluna), mantida aqui como referência."""
+
+    df = raw_df.copy()
+    
+    # 1. Encontrar o Título do Período (ex: "1° PERÍODO")
+    periodo_title = None
+    for i, row in df.iterrows():
+        cell_value = _clean_string_reference(row.iloc[0])
+        # (Adicionado 'cell_value is not None' por segurança após a correção)
+        if cell_value is not None and "PERÍODO" in cell_value.upper():
+            periodo_title = cell_value
+            break
+            
+    # 2. Encontrar a Linha de Cabeçalho ("DISCIPLINA")
+    header_row_index = -1
+    for i, row in df.iterrows():
+        cell_value_0 = _clean_string_reference(row.iloc[0])
+        if cell_value_0 is not None and "DISCIPLINA" in cell_value_0.upper():
+            header_row_index = i
+            break
+            
+    if header_row_index == -1:
+        print("      [ppc.py] Alerta: _parse_matriz_curricular não encontrou 'DISCIPLINA'.")
+        return None
+
+    # 3. Definir o Início dos Dados
+    data_start_index = header_row_index + 2
+    
+    if data_start_index >= len(df):
+         print(f"      [ppc.py] Alerta: Encontrou cabeçalho mas não encontrou linhas de dados para '{periodo_title}'.")
+         return None
+    
+    # 4. Processar o DataFrame
+    data_df = df.iloc[data_start_index:].copy()
+    
+    expected_columns = [
+        'DISCIPLINA', 'CH_Semanal_Teorica', 'CH_Semanal_Pratica',
+        'CH_Semanal_Total', 'CH_Semestral_Hora_Aula', 'CH_Semestral_Horas',
+        'Pre_Requisitos'
+    ]
+    
+    num_cols = len(data_df.columns)
+    if num_cols > len(expected_columns):
+        data_df = data_df.iloc[:, :len(expected_columns)]
+        num_cols = len(expected_columns)
+        
+    data_df.columns = expected_columns[:num_cols]
+    
+    for i in range(num_cols, len(expected_columns)):
+        data_df[expected_columns[i]] = None
+        
+    # 5. Limpar os Dados
+    data_df = data_df[data_df['DISCIPLINA'].astype(str).str.contains('TOTAL', case=False, na=False) == False]
+    
+    for col in data_df.columns:
+        data_df[col] = data_df[col].apply(_clean_string_reference)
+        
+    data_df.dropna(how='all', inplace=True)
+
+    if data_df.empty:
+        return None
+
+    table_dict_list = data_df.where(pd.notna(data_df), None).to_dict(orient='records')
+    
+    return {
+        "periodo": periodo_title,
+        "disciplinas": table_dict_list
+    }
+
+
+def _parse_optativas_reference(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """_parse_optativas original (iterrows + apply(_clean_string) por coluna), mantida aqui como referência."""
+
+    if raw_df is None or raw_df.empty:
+        return None
+
+    df = raw_df.copy()
+
+    # 1. Tentar Encontrar a Linha de Cabeçalho ("DISCIPLINA")
+    header_row_index = -1
+    for i, row in df.iterrows():
+        cell_value = _clean_string_reference(row.iloc[0])
+        if cell_value is not None and "DISCIPLINA" in cell_value.upper():
+            header_row_index = i
+            break
+            
+    # 2. Definir o Início dos Dados
+    data_start_index = 0
+    if header_row_index != -1:
+        data_start_index = header_row_index + 2
+    else:
+        print(f"      [ppc.py] Info: _parse_optativas não encontrou 'DISCIPLINA'. Tratando como página de continuação.")
+            
+    if data_start_index >= len(df):
+         print(f"      [ppc.py] Alerta: _parse_optativas não encontrou linhas de dados após o índice {data_start_index}.")
+         return None
+    
+    # 3. Processar o DataFrame
+    data_df = df.iloc[data_start_index:].copy()
+    
+    expected_columns = [
+        'DISCIPLINA', 'CH_Semanal_Teorica', 'CH_Semanal_Pratica',
+        'CH_Semanal_Total', 'CH_Semestral_Hora_Aula', 'CH_Semestral_Horas',
+        'Pre_Requisitos'
+    ]
+    
+    num_cols = len(data_df.columns)
+    if num_cols > len(expected_columns):
+        data_df = data_df.iloc[:, :len(expected_columns)]
+        num_cols = len(expected_columns)
+        
+    data_df.columns = expected_columns[:num_cols]
+    
+    for i in range(num_cols, len(expected_columns)):
+        data_df[expected_columns[i]] = None
+        
+    # 4. Limpar os Dados
+    data_df['DISCIPLINA'] = data_df['DISCIPLINA'].ffill()
+
+    for col in data_df.columns:
+        data_df[col] = data_df[col].apply(_clean_string_reference)
+        
+    data_df.dropna(how='all', inplace=True)
+    data_df.dropna(subset=['CH_Semanal_Total'], inplace=True)
+
+    if data_df.empty:
+        return None
+
+    def aggregate_text(rows):
+        return ' '.join(rows.dropna().unique())
+
+    grouped = data_df.groupby('DISCIPLINA')
+    
+    aggregated_df = pd.DataFrame({
+        'CH_Semanal_Teorica': grouped['CH_Semanal_Teorica'].first(),
+        'CH_Semanal_Pratica': grouped['CH_Semanal_Pratica'].first(),
+        'CH_Semanal_Total': grouped['CH_Semanal_Total'].first(),
+        'CH_Semestral_Hora_Aula': grouped['CH_Semestral_Hora_Aula'].first(),
+        'CH_Semestral_Horas': grouped['CH_Semestral_Horas'].first(),
+        'Pre_Requisitos': grouped['Pre_Requisitos'].apply(aggregate_text)
+    }).reset_index()
+
+    table_dict_list = aggregated_df.where(pd.notna(aggregated_df), None).to_dict(orient='records')
+    
+    return {
+        "disciplinas_optativas": table_dict_list
+    }
+
+
+def _parse_docentes_reference(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """_parse_docentes original (iterrows + apply(_clean_string) por coluna), mantida aqui como referência."""
+
+    df = raw_df.copy()
+    
+    header_row_index = -1
+    for i, row in df.iterrows():
+        row_str = ' '.join(row.dropna().astype(str)).lower()
+        if "nome do professor" in row_str and "regime de trabalho" in row_str:
+            header_row_index = i
+            break
+            
+    if header_row_index != -1:
+        df = df.iloc[header_row_index + 1:].reset_index(drop=True)
+
+    expected_columns = ['Item', 'Nome do Professor', 'Formacao', 'Regime de Trabalho']
+    
+    num_cols = len(df.columns)
+    if num_cols < 4:
+        if num_cols == 3:
+             print("      [ppc.py] Alerta: Tabela de docente com 3 colunas. Assumindo [Nome, Formacao, Regime].")
+             df.columns = expected_columns[1:] # Usa Nome, Formacao, Regime
+             df['Item'] = pd.NA # Adiciona coluna de Item vazia
+        else:
+             print(f"      [ppc.py] Alerta: Tabela de docente com colunas inesperadas ({num_cols}). Pulando.")
+             return None
+    else:
+        df = df.iloc[:, :4]
+        df.columns = expected_columns
+    
+    for col in df.columns:
+        df[col] = df[col].apply(_clean_string_reference)
+        
+    df.dropna(how='all', inplace=True)
+
+    # Preenche 'Item' e 'Nome' para baixo para associar as linhas de formação
+    df['Item'] = df['Item'].ffill()
+    df['Nome do Professor'] = df['Nome do Professor'].ffill()
+    
+    df.dropna(subset=['Formacao'], inplace=True)
+    
+    if df.empty:
+        return None
+
+    def aggregate_formation(rows):
+        full_formation = ' '.join(rows.dropna())
+        return full_formation
+
+    grouped = df.groupby('Nome do Professor')
+    
+    aggregated_df = pd.DataFrame({
+        'Item': grouped['Item'].first(), # Pega o primeiro item
+        'Formacao': grouped['Formacao'].apply(aggregate_formation),
+        'Regime de Trabalho': grouped['Regime de Trabalho'].last()
+    }).reset_index() 
+
+    # Reordena colunas
+    final_cols = ['Item', 'Nome do Professor', 'Formacao', 'Regime de Trabalho']
+    aggregated_df = aggregated_df[[col for col in final_cols if col in aggregated_df.columns]]
+    
+    aggregated_df = aggregated_df.where(pd.notna(aggregated_df), None)
+
+    return {
+        "docentes": aggregated_df.to_dict(orient='records')
+    }
+
+
+def _run_pages(context: DocumentContext, pages: list[int]) -> list:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [ppc.parse_ppc_page(context.pdf_path, page_num, context=context)["parsed_data_list"] for page_num in pages]
+
+
+def _capture_parser_calls(context: DocumentContext, pages: list[int]) -> list[tuple]:
+    """(nome do parser, tabela) de cada chamada que parse_ppc_page faz aos três parsers."""
+    calls, current = [], {name: getattr(ppc, name) for name in PARSERS}
+
+    def recorder(name):
+        def record(raw_df):
+            calls.append((name, raw_df))
+            return current[name](raw_df)
+        return record
+
+    try:
+        for name in PARSERS:
+            setattr(ppc, name, recorder(name))
+        _run_pages(context, pages)
+    finally:
+        for name, func in current.items():
+            setattr(ppc, name, func)
+    return calls
+
+
+def _best_of(func, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _same(a, b) -> bool:
+    # json.dumps: NaN != NaN numa comparação direta
+    return json.dumps(a, default=str) == json.dumps(b, default=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", default="PPCBCC2019.pdf", help="PDF em data/input")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with DocumentContext(str(ROOT / 'data' / 'input' / args.pdf)) as context:
+        pages = [page_num for page_num in range(1, context.page_count + 1)
+                 if identify_page_type(context.page(page_num), text=context.page_text(page_num)) == "ppc"]
+        context.extract_tables(pages)
+        calls = _capture_parser_calls(context, pages)
+
+        # 1. Só os três parsers, nas tabelas que parse_ppc_page entrega a eles
+        identical = True
+        print(f"Páginas de PPC: {len(pages)} | chamadas aos parsers: {len(calls)}")
+        for name in PARSERS:
+            tables = [raw_df for called, raw_df in calls if called == name]
+            if not tables:
+                continue
+            reference, current = globals()[f"{name}_reference"], getattr(ppc, name)
+            with contextlib.redirect_stdout(io.StringIO()):
+                t_ref, expected = _best_of(lambda: [reference(raw_df) for raw_df in tables], args.repeat * 10)
+                t_new, result = _best_of(lambda: [current(raw_df) for raw_df in tables], args.repeat * 10)
+            same = _same(result, expected)
+            identical = identical and same
+            cells = sum(raw_df.size for raw_df in tables)
+            print(f"  {name:25}: {len(tables)} tabela(s), {cells} células | {t_ref * 1000:6.2f}ms -> "
+                  f"{t_new * 1000:6.2f}ms ({t_ref / t_new:4.2f}x) | idêntico: {same}")
+
+        # 2. parse_ppc_page em todas as páginas (roteamento, texto bruto e parsers)
+        current = {name: getattr(ppc, name) for name in PARSERS}
+        t_new, result = _best_of(lambda: _run_pages(context, pages), args.repeat)
+        try:
+            for name in PARSERS:
+                setattr(ppc, name, globals()[f"{name}_reference"])
+            t_ref, expected = _best_of(lambda: _run_pages(context, pages), args.repeat)
+        finally:
+            for name, func in current.items():
+                setattr(ppc, name, func)
+
+    same = _same(result, expected)
+    identical = identical and same
+    print(f"  parse_ppc_page (todas)   : {t_ref * 1000:6.1f}ms -> {t_new * 1000:6.1f}ms ({t_ref / t_new:4.2f}x)")
+    print(f"  parsed_data_list idênticos: {same}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Suíte de benchmarks do estágio de texto (extract_raw -> detect_structure -> normalize_text).
+
+Executa cada estágio sobre os PDFs de data/input (offline, só CPU) e grava um relatório JSON
+com tempo de parede, páginas/s, blocos/s e pico de RSS por documento e por estágio. Se houver
+um baseline salvo, compara e aponta regressões acima do limiar configurado (código de saída 1).
+
+Uso:
+    python benchmarks/run_benchmarks.py                      # mede e compara com o baseline
+    python benchmarks/run_benchmarks.py --update-baseline    # mede e grava como novo baseline
+    python benchmarks/run_benchmarks.py --threshold 0.1 --docs Estatuto PPCBCC2019
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'src'))
+
+import pdfplumber
+from extract_raw import extract_raw, BACKENDS
+from detect_structure import detect_structure
+from normalize_text import normalize_text
+from memory_usage import PeakRSSSampler
+
+STAGES = ("extract_raw", "detect_structure", "normalize_text")
+
+
+def _load_dictionaries(path: Path) -> tuple[dict, dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            dictionaries = json.load(f)
+    except FileNotFoundError:
+        print(f"AVISO: '{path}' não encontrado. normalize_text rodará sem dicionários.")
+        return {}, {}
+    return dictionaries.get("acronyms", {}), dictionaries.get("standardization_map", {})
+
+
+def _measure(fn, repeat: int) -> tuple:
+    """
+    Executa fn() `repeat` vezes; retorna (resultado, menor tempo em s, memória), onde
+    memória = (pico de RSS do processo, aumento do RSS durante o estágio), em MB.
+    """
+    best_time = None
+    peak_mb = increase_mb = 0.0
+    result = None
+    for _ in range(repeat):
+        with PeakRSSSampler() as mem:
+            t0 = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - t0
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+        peak_mb = max(peak_mb, mem.peak_mb)
+        increase_mb = max(increase_mb, mem.peak_mb - mem.start_mb)
+    return result, best_time, (peak_mb, increase_mb)
+
+
+def _stage_metrics(wall_time: float, pages: int, blocks: int, memory: tuple) -> dict:
+    peak_mb, increase_mb = memory
+    return {
+        "wall_time_s": round(wall_time, 4),
+        "pages_per_s": round(pages / wall_time, 2) if wall_time > 0 else None,
+        "blocks_per_s": round(blocks / wall_time, 2) if wall_time > 0 else None,
+        "blocks": blocks,
+        "peak_rss_mb": round(peak_mb, 1),
+        "rss_increase_mb": round(increase_mb, 1),
+    }
+
+
+def benchmark_document(pdf_path: Path, acronyms: dict, standardization_map: dict, args) -> dict:
+    with pdfplumber.open(pdf_path) as pdf:
+        n_pages = len(pdf.pages)
+
+    blocks, t_extract, mem_extract = _measure(
+        lambda: extract_raw(str(pdf_path), workers=args.workers, backend=args.backend,
+                            low_memory=args.low_memory),
+        args.repeat
+    )
+    _, t_structure, mem_structure = _measure(lambda: detect_structure(str(pdf_path), blocks), args.repeat)
+    _, t_normalize, mem_normalize = _measure(
+        lambda: [normalize_text(b["text"], acronyms=acronyms, standardization_map=standardization_map)
+                 for b in blocks],
+        args.repeat
+    )
+
+    n_blocks = len(blocks)
+    return {
+        "pages": n_pages,
+        "blocks": n_blocks,
+        "stages": {
+            "extract_raw": _stage_metrics(t_extract, n_pages, n_blocks, mem_extract),
+            "detect_structure": _stage_metrics(t_structure, n_pages, n_blocks, mem_structure),
+            "normalize_text": _stage_metrics(t_normalize, n_pages, n_blocks, mem_normalize),
+        },
+    }
+
+
+def _totals(documents: dict) -> dict:
+    pages = sum(d["pages"] for d in documents.values())
+    blocks = sum(d["blocks"] for d in documents.values())
+    totals = {}
+    for stage in STAGES:
+        wall_time = sum(d["stages"][stage]["wall_time_s"] for d in documents.values())
+        peak_mb = max((d["stages"][stage]["peak_rss_mb"] for d in documents.values()), default=0.0)
+        increase_mb = max((d["stages"][stage]["rss_increase_mb"] for d in documents.values()), default=0.0)
+        totals[stage] = _stage_metrics(wall_time, pages, blocks, (peak_mb, increase_mb))
+    return totals
+
+
+def compare_with_baseline(report: dict, baseline: dict, threshold: float,
+                          memory_threshold: float, min_time: float) -> list[str]:
+    """
+    Lista as regressões: tempo acima de (1 + threshold) x baseline (ignorando estágios com
+    menos de min_time s no baseline, dominados por ruído) ou pico de RSS acima de
+    (1 + memory_threshold) x baseline.
+    """
+    regressions = []
+    for name, doc in report["documents"].items():
+        base_doc = baseline.get("documents", {}).get(name)
+        if not base_doc:
+            continue
+        for stage, metrics in doc["stages"].items():
+            base = base_doc.get("stages", {}).get(stage)
+            if not base:
+                continue
+            base_time, cur_time = base["wall_time_s"], metrics["wall_time_s"]
+            if base_time >= min_time and cur_time > base_time * (1 + threshold):
+                regressions.append(
+                    f"{name} / {stage}: tempo {cur_time:.3f}s vs baseline {base_time:.3f}s "
+                    f"(+{(cur_time / base_time - 1) * 100:.0f}%)"
+                )
+            base_mem, cur_mem = base.get("peak_rss_mb") or 0, metrics.get("peak_rss_mb") or 0
+            if base_mem and cur_mem > base_mem * (1 + memory_threshold):
+                regressions.append(
+                    f"{name} / {stage}: pico de RSS {cur_mem:.0f} MB vs baseline {base_mem:.0f} MB "
+                    f"(+{(cur_mem / base_mem - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _print_summary(report: dict) -> None:
+    print(f"\n{'Documento':<42} {'Estágio':<17} {'tempo (s)':>10} {'págs/s':>9} {'blocos/s':>10} "
+          f"{'RSS (MB)':>9} {'+RSS (MB)':>10}")
+    rows = list(report["documents"].items()) + [("TOTAL", {"stages": report["totals"]})]
+    for name, doc in rows:
+        for stage, m in doc["stages"].items():
+            print(f"{name[:42]:<42} {stage:<17} {m['wall_time_s']:>10.3f} {m['pages_per_s'] or 0:>9.1f} "
+                  f"{m['blocks_per_s'] or 0:>10.1f} {m['peak_rss_mb']:>9.0f} {m['rss_increase_mb']:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input-dir", default=str(ROOT / "data/input"))
+    parser.add_argument("--dictionaries", default=None, help="padrão: <input-dir>/dicionarios.json")
+    parser.add_argument("--docs", nargs="*", help="filtra documentos cujo nome contenha algum destes termos")
+    parser.add_argument("--output", default=str(ROOT / "benchmarks/results/latest.json"))
+    parser.add_argument("--baseline", default=str(ROOT / "benchmarks/baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true", help="grava o relatório como novo baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="regressão de tempo tolerada (0.20 = +20%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.20, help="regressão de pico de RSS tolerada")
+    parser.add_argument("--min-time", type=float, default=0.05, help="ignora tempos de baseline abaixo disto (s)")
+    parser.add_argument("--repeat", type=int, default=1, help="repetições por estágio (usa o menor tempo)")
+    parser.add_argument("--backend", choices=BACKENDS, default="pdfplumber")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--low-memory", action="store_true")
+    args = parser.parse_args()
+
+    input_dir = Path(args.input_dir)
+    pdf_files = sorted(input_dir.glob("*.pdf"))
+    if args.docs:
+        pdf_files = [p for p in pdf_files if any(term.lower() in p.name.lower() for term in args.docs)]
+    if not pdf_files:
+        print(f"ERRO: Nenhum PDF encontrado em '{input_dir}'.")
+        return 2
+
+    acronyms, standardization_map = _load_dictionaries(
+        Path(args.dictionaries) if args.dictionaries else input_dir / "dicionarios.json"
+    )
+
+    documents = {}
+    for pdf_path in pdf_files:
+        print(f"-> {pdf_path.name}...", flush=True)
+        documents[pdf_path.name] = benchmark_document(pdf_path, acronyms, standardization_map, args)
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "backend": args.backend,
+            "workers": args.workers,
+            "low_memory": args.low_memory,
+            "repeat": args.repeat,
+        },
+        "documents": documents,
+        "totals": _totals(documents),
+    }
+    _print_summary(report)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nRelatório salvo em '{output_path}'.")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Baseline atualizado em '{baseline_path}'.")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"Sem baseline em '{baseline_path}'. Rode com --update-baseline para criá-lo.")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(report, baseline, args.threshold, args.memory_threshold, args.min_time)
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) em relação ao baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nNenhuma regressão em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,10 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent / 'src'))
 
-from extract_raw import extract_raw
-from normalize_text import normalize_text
+from extract_raw import iter_text_blocks
+from normalize_text import Normalizer, NormalizationMemo, load_normalizer
 from detect_structure import detect_structure
+from citation_index import CitationIndex, citation_index_path
 from extract_tables import extract_tables
 from deduplicate import deduplicate
 from enrich_metadata import enrich_metadata
@@ -19,6 +20,15 @@ def main():
     # Ajuste para o caminho correto, já que o script está em project/src/
     input_dir = Path('data/input')
     output_dir = Path('data/output')
+    # Cache em disco das páginas já extraídas (reexecuções sobre o mesmo PDF não reprocessam)
+    cache_dir = Path('data/cache/pages')
+    # Memo em disco dos textos já normalizados (trechos repetidos entre documentos e reexecuções)
+    normalize_cache_dir = Path('data/cache/normalized')
+    # Processos do Camelot na extração de tabelas (1 = sequencial) e tempo máximo por bloco de páginas
+    table_workers = max(1, min(4, os.cpu_count() or 1))
+    table_timeout = 300
+    # Cache em disco das tabelas do Camelot por página (compartilhado com o table_pipeline)
+    table_cache_dir = Path('data/cache/tables')
     
     # Define o caminho para o arquivo de dicionários usando a variável 'input_dir' já criada.
     dictionaries_path = input_dir / 'dicionarios.json'
@@ -58,34 +68,56 @@ def main():
     base_name = input_pdf_path.stem
 
     # --- Carregamento dos Dicionários (Equipe 2) ---
+    # O Normalizer compila os dicionários uma única vez (reaproveitado enquanto o arquivo não mudar)
     try:
-        with open(dictionaries_path, 'r', encoding='utf-8') as f:
-            dictionaries = json.load(f)
-        acronyms = dictionaries.get("acronyms", {})
-        standardization_map = dictionaries.get("standardization_map", {})
+        normalizer = load_normalizer(str(dictionaries_path))
         print("-> Dicionários de normalização carregados com sucesso.")
     except FileNotFoundError:
         print(f"-> AVISO: Arquivo '{dictionaries_path}' não encontrado. A normalização será limitada.")
-        acronyms = {}
-        standardization_map = {}
+        normalizer = Normalizer()
 
     # --- Execução do Pipeline ---
     print("\n1. Extraindo blocos de texto com metadados (página, bbox)...")
-    text_blocks = extract_raw(str(input_pdf_path))
-
-    # Concatena o texto para a normalização (o normalized_text não é mais usado na detecção de estrutura)
-    raw_text = " ".join(block["text"] for block in text_blocks)
-
-    print("2. Normalizando texto...")
-    normalized_text = normalize_text(raw_text, acronyms=acronyms, standardization_map=standardization_map)
+    # Os blocos são gerados página a página e consumidos diretamente pela detecção de estrutura,
+    # sem montar a lista completa nem concatenar o documento inteiro em memória.
+    text_blocks = iter_text_blocks(str(input_pdf_path), cache_dir=str(cache_dir), low_memory=True)
+
+    # O texto normalizado só é usado na prévia: normaliza apenas os primeiros blocos, até
+    # juntar 100 caracteres, com o Normalizer compilado uma única vez.
+    memo = NormalizationMemo(cache_dir=str(normalize_cache_dir))
+    preview_parts = []
+    preview_len = 0
+
+    def _blocks_with_preview(blocks):
+        nonlocal preview_len
+        for block in blocks:
+            if preview_len < 100:
+                normalized = memo.normalize(normalizer, block["text"])
+                if normalized:
+                    preview_parts.append(normalized)
+                    preview_len += len(normalized) + 1
+            yield block
+
+    print("2. Detectando estrutura (em streaming com a extração)...")
+    # A função detect_structure recebe os blocos de texto com metadados
+    try:
+        structured_content = detect_structure(str(input_pdf_path), _blocks_with_preview(text_blocks))
+    except Exception:
+        # iter_text_blocks já imprimiu o erro: segue com o documento sem texto (como o extract_raw,
+        # que retorna []), para que as tabelas e a saída ainda sejam geradas
+        print(f"-> AVISO: Extração de texto de '{input_pdf_path.name}' interrompida. Seguindo sem a estrutura de texto.")
+        structured_content = detect_structure(str(input_pdf_path), [])
+
+    print("3. Texto normalizado...")
+    memo.save()
+    memo_stats = memo.stats()
+    print(f"   Memo de normalização: {memo_stats['hits']} reaproveitados, {memo_stats['misses']} normalizados")
+    normalized_text = " ".join(preview_parts)
     print(f"   Prévia: '{normalized_text[:100]}...'")
 
-    print("3. Detectando estrutura...")
-    # A função detect_structure agora recebe os blocos de texto com metadados
-    structured_content = detect_structure(str(input_pdf_path), text_blocks)
-
     print("4. Extraindo tabelas...")
-    tables_data = extract_tables(str(input_pdf_path))
+    tables_data = extract_tables(str(input_pdf_path), workers=table_workers, timeout=table_timeout,
+                                 cache_dir=str(table_cache_dir))
 
     print("5. Deduplicando conteúdo...")
     deduplicated_content = deduplicate(structured_content) 
@@ -108,6 +140,13 @@ def main():
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(final_document, f, ensure_ascii=False, indent=4)
 
+    # Índice de citações ao lado do JSON de saída (usado pelo RAG). É montado a partir da
+    # estrutura final (já deduplicada), para que as posições batam com o JSON gravado.
+    citation_index = CitationIndex.from_estrutura(final_document["estrutura"])
+    index_path = citation_index_path(output_path)
+    citation_index.save(index_path)
+    print(f"Índice de citações ({len(citation_index.artigos)} artigos) salvo em '{index_path}'.")
+
     print("\nPipeline finalizado com sucesso!")
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+import os
+import json
+import time
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import camelot
+import pandas as pd
+from pypdf import PdfReader
+
+from page_cache import PageCache, file_sha256
+
+# Parâmetros do Camelot que não mudam as tabelas extraídas (ficam fora da chave do cache)
+_OUTPUT_ONLY_KWARGS = ("suppress_stdout",)
+
+
+def _table_record(table) -> dict:
+    """
+    O que os consumidores usam de uma tabela do Camelot, num dict leve para trafegar
+    entre processos (o objeto Table inteiro, com células e linhas, passa de 400 KB).
+    """
+    return {
+        "page": int(table.page),
+        "order": table.order,
+        "bbox": tuple(table._bbox),
+        "parsing_report": table.parsing_report,
+        "df": table.df,
+    }
+
+
+def _read_chunk(args: tuple) -> list[dict]:
+    pdf_path, pages, flavor, camelot_kwargs = args
+    tables = camelot.read_pdf(pdf_path, pages=",".join(map(str, pages)), flavor=flavor, **camelot_kwargs)
+    return [_table_record(table) for table in tables]
+
+
+@lru_cache(maxsize=64)
+def _file_hash(path: str, mtime_ns: int, size: int) -> str:
+    return file_sha256(path)
+
+
+def _pdf_hash(pdf_path: str) -> str:
+    """Hash do PDF, calculado uma vez enquanto o arquivo não mudar (get_raw_tables_from_page é chamada por página)."""
+    stat = os.stat(pdf_path)
+    return _file_hash(os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_base_key(pdf_path: str, flavor: str, camelot_kwargs: dict) -> dict:
+    """Chave do documento no cache: hash do PDF, flavor, parâmetros e versão do Camelot."""
+    kwargs = {k: v for k, v in camelot_kwargs.items() if k not in _OUTPUT_ONLY_KWARGS}
+    return {
+        "kind": "camelot_tables",
+        "file_sha256": _pdf_hash(pdf_path),
+        "flavor": flavor,
+        "camelot_version": camelot.__version__,
+        # Normaliza os parâmetros para JSON (ex: tuplas viram listas, objetos viram repr)
+        "camelot_kwargs": json.loads(json.dumps(kwargs, sort_keys=True, default=repr)),
+    }
+
+
+def _to_cache_value(records: list[dict]) -> list[dict]:
+    return [{"order": r["order"], "bbox": list(r["bbox"]), "parsing_report": r["parsing_report"],
+             "cells": r["df"].values.tolist()} for r in records]
+
+
+def _from_cache_value(page: int, value: list[dict]) -> list[dict]:
+    return [{"page": page, "order": v["order"], "bbox": tuple(v["bbox"]),
+             "parsing_report": v["parsing_report"], "df": pd.DataFrame(v["cells"])} for v in value]
+
+
+def split_pages(pages: list[int], chunk_size: int) -> list[list[int]]:
+    """Divide as páginas (ordenadas) em blocos consecutivos de até chunk_size páginas."""
+    pages = sorted(set(pages))
+    chunk_size = max(1, chunk_size)
+    return [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+
+
+def _terminate_workers(executor: ProcessPoolExecutor, processes: list) -> None:
+    """Encerra os workers presos num bloco que estourou o timeout (shutdown sozinho esperaria por eles)."""
+    terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def read_tables(pdf_path: str, pages, flavor: str, workers: int = 1, chunk_size: int = 4,
+                timeout: float = None, cache_dir: str = None, stats: dict = None,
+                **camelot_kwargs) -> list[dict]:
+    """
+    Roda camelot.read_pdf nas páginas pedidas e retorna as tabelas como dicts
+    {"page", "order", "bbox", "parsing_report", "df"}, ordenadas por página e ordem na página.
+
+    Com workers <= 1, é uma única chamada ao Camelot no processo atual (erros sobem para
+    quem chamou). Com workers > 1, as páginas são divididas em blocos de chunk_size e
+    processadas por um pool de processos (o lattice rasteriza cada página e não usa mais
+    de um núcleo); os resultados são juntados na ordem dos blocos, então a saída é a
+    mesma da execução sequencial. Um bloco que falha ou passa de timeout segundos
+    (contados do início do bloco) só perde as suas páginas: o aviso é impresso e os
+    demais blocos seguem; o worker preso é encerrado no final.
+
+    Com cache_dir (padrão None: sem cache), as tabelas de cada página
+    ficam num PageCache em disco, com chave (hash do PDF, página, flavor, camelot_kwargs,
+    versão do Camelot): só as páginas ausentes do cache vão ao Camelot, e páginas sem
+    tabela também são guardadas. O Camelot processa cada página de forma independente,
+    então o resultado é o mesmo da chamada sem cache. Páginas perdidas por erro ou
+    timeout não são gravadas.
+
+    Args:
+        pages: lista de páginas (a partir de 1) ou 'all'.
+        camelot_kwargs: repassados ao camelot.read_pdf (ex: line_scale=40, suppress_stdout=True).
+        stats (dict, opcional): recebe "chunks", "failed_pages", "timed_out_pages" e, com
+                                cache, "cache_hits" e "cache_misses" (em páginas).
+    """
+    run_stats = {"chunks": 0, "failed_pages": [], "timed_out_pages": [], "cache_hits": 0, "cache_misses": 0}
+    if stats is not None:
+        stats.update(run_stats)
+        run_stats = stats
+
+    if not cache_dir:
+        return _run_camelot(pdf_path, pages, flavor, workers, chunk_size, timeout, run_stats, camelot_kwargs)
+
+    if pages == 'all':
+        pages = range(1, len(PdfReader(pdf_path).pages) + 1)
+    pages = sorted(set(pages))
+    cache = PageCache(cache_dir)
+    base_key = _cache_base_key(pdf_path, flavor, camelot_kwargs)
+
+    records_by_page, missing = {}, []
+    for page in pages:
+        value = cache.get({**base_key, "page": page})
+        if value is None:
+            missing.append(page)
+        else:
+            records_by_page[page] = _from_cache_value(page, value)
+    run_stats["cache_hits"], run_stats["cache_misses"] = len(pages) - len(missing), len(missing)
+
+    if missing:
+        computed = {page: [] for page in missing}
+        for record in _run_camelot(pdf_path, missing, flavor, workers, chunk_size, timeout,
+                                   run_stats, camelot_kwargs):
+            computed[record["page"]].append(record)
+        lost = set(run_stats["failed_pages"]) | set(run_stats["timed_out_pages"])
+        for page, records in computed.items():
+            if page not in lost:
+                cache.put({**base_key, "page": page}, _to_cache_value(records))
+        records_by_page.update(computed)
+        cache.evict()
+
+    return [record for page in pages for record in records_by_page.get(page, [])]
+
+
+def _run_camelot(pdf_path: str, pages, flavor: str, workers: int, chunk_size: int, timeout: float,
+                 run_stats: dict, camelot_kwargs: dict) -> list[dict]:
+    """Execução do Camelot de read_tables (sequencial ou em blocos no pool), sem cache."""
+    if workers <= 1:
+        run_stats["chunks"] = 1
+        page_spec = 'all' if pages == 'all' else ",".join(map(str, sorted(set(pages))))
+        tables = camelot.read_pdf(pdf_path, pages=page_spec, flavor=flavor, **camelot_kwargs)
+        return [_table_record(table) for table in tables]
+
+    if pages == 'all':
+        pages = range(1, len(PdfReader(pdf_path).pages) + 1)
+    chunks = split_pages(pages, chunk_size)
+    run_stats["chunks"] = len(chunks)
+    results = [[] for _ in chunks]
+
+    queued = deque(enumerate(chunks))
+    running = {}     # future -> (índice do bloco, páginas, início)
+    stuck = set()    # blocos que estouraram o timeout e ainda ocupam um worker
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+    processes = []
+    try:
+        while queued or running:
+            stuck = {future for future in stuck if not future.done()}
+            # Só envia blocos para workers livres: o tempo de cada um conta a partir do envio
+            while queued and len(running) + len(stuck) < workers:
+                index, chunk_pages = queued.popleft()
+                future = executor.submit(_read_chunk, (pdf_path, chunk_pages, flavor, camelot_kwargs))
+                running[future] = (index, chunk_pages, time.monotonic())
+            processes = list((getattr(executor, "_processes", None) or {}).values()) or processes
+            if not running:
+                # Todos os workers presos: as páginas restantes ficam sem tabelas
+                for index, chunk_pages in queued:
+                    run_stats["timed_out_pages"].extend(chunk_pages)
+                queued.clear()
+                break
+
+            wait_for = None
+            if timeout is not None:
+                oldest = min(started for _, _, started in running.values())
+                wait_for = max(0.0, oldest + timeout - time.monotonic())
+            done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, chunk_pages, _ = running.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Aviso: Camelot (flavor='{flavor}') falhou nas páginas {chunk_pages}: {e}")
+                    run_stats["failed_pages"].extend(chunk_pages)
+
+            if timeout is not None:
+                now = time.monotonic()
+                for future, (index, chunk_pages, started) in list(running.items()):
+                    if now - started >= timeout:
+                        print(f"Aviso: Camelot (flavor='{flavor}') passou de {timeout}s nas páginas {chunk_pages}; ignoradas.")
+                        running.pop(future)
+                        stuck.add(future)
+                        run_stats["timed_out_pages"].extend(chunk_pages)
+    finally:
+        stuck = {future for future in stuck if not future.done()}
+        if stuck:
+            _terminate_workers(executor, processes)
+        executor.shutdown(wait=not stuck, cancel_futures=True)
+
+    return [record for chunk_records in results for record in chunk_records]
@@ -0,0 +1,230 @@
+import os
+import re
+import json
+import tempfile
+from pathlib import Path
+
+# Incrementar quando o formato do índice mudar
+# (2: incisos de um parágrafo são chaveados com o parágrafo, ex: "1.iv";
+#  3: artigos com letra têm chave própria, ex: "80-d")
+INDEX_VERSION = 3
+
+# Número com letra opcional de artigos incluídos: "42", "80-D"
+_NUMBER = re.compile(r"(\d+)(?:-([a-z])\b)?", re.IGNORECASE)
+_ROMAN = re.compile(r"[ivxlcdm]+", re.IGNORECASE)
+
+# Citações em texto livre: "Art. 42", "artigo 42º", "§ 2º", "parágrafo único", "inciso IV"
+_ARTICLE_CITATION = re.compile(r"\bart(?:igo)?\.?\s*(\d+(?:-[a-z]\b)?)", re.IGNORECASE)
+_PARAGRAPH_CITATION = re.compile(r"(?:§\s*(\d+)|\bpar[aá]grafo\s+([uú]nico|\d+))", re.IGNORECASE)
+_INCISO_CITATION = re.compile(r"\binciso\s+([ivxlcdm]+)\b", re.IGNORECASE)
+# Rótulo de artigo no texto do documento ("Art. 43"); citações no corpo usam "art."
+_ARTICLE_LABEL = re.compile(r"\bArt\.?\s*(\d+(?:-[A-Za-z]\b)?)")
+
+def citation_key(label) -> str:
+    """
+    Normaliza o rótulo de um artigo, parágrafo ou inciso para a chave do índice:
+    "Art. 42º" -> "42", "Art. 80-D" -> "80-d", "§ 1º" -> "1", "Parágrafo único" -> "unico", "IV -" -> "iv".
+    Retorna None se o rótulo não tiver número reconhecível.
+    """
+    if label is None:
+        return None
+    label = str(label).strip()
+    number = _NUMBER.search(label)
+    if number:
+        key = str(int(number.group(1)))
+        return f"{key}-{number.group(2).lower()}" if number.group(2) else key
+    lowered = label.lower()
+    if "único" in lowered or "unico" in lowered:
+        return "unico"
+    roman = _ROMAN.match(lowered)
+    if roman:
+        return roman.group().lower()
+    return None
+
+def _is_paragraph_label(label: str) -> bool:
+    """True para rótulos de parágrafo ("§ 1º", "Parágrafo único"); False para incisos ("IV -")."""
+    label = str(label).strip().lower()
+    return label.startswith("§") or label.startswith("parágrafo") or label.startswith("paragrafo")
+
+def paragraph_key(paragrafo=None, inciso=None) -> str:
+    """
+    Chave de um parágrafo/inciso dentro do artigo: "§ 1º" -> "1", inciso IV do caput -> "iv",
+    inciso IV do § 1º -> "1.iv". Retorna None se não houver rótulo reconhecível.
+    """
+    paragrafo = citation_key(paragrafo)
+    inciso = citation_key(inciso)
+    if inciso is None:
+        return paragrafo
+    return f"{paragrafo}.{inciso}" if paragrafo is not None else inciso
+
+def citation_index_path(output_path: str) -> Path:
+    """Caminho do índice de citações ao lado do JSON de saída: <nome>_citacoes.json."""
+    output_path = Path(output_path)
+    base_name = output_path.stem
+    if base_name.endswith("_output"):
+        base_name = base_name[:-len("_output")]
+    return output_path.with_name(f"{base_name}_citacoes.json")
+
+class CitationIndex:
+    """
+    Índice de citações de um documento: número do artigo -> posição em "estrutura" e
+    página, e, dentro de cada artigo, número do parágrafo/inciso -> posição em
+    "paragrafos" e página. Permite resolver "Art. 42, § 1º, inciso II" em O(1), sem busca
+    semântica. Incisos ficam sob o parágrafo em que aparecem (chave "1.ii"; ver
+    paragraph_key), então o inciso I do § 1º e o do § 2º não se confundem.
+
+    Pode ser preenchido por detect_structure (parâmetro citation_index) enquanto a estrutura
+    é montada ou, depois que a estrutura final existir (deduplicada/integrada), montado com
+    from_estrutura. Se um artigo (ou parágrafo/inciso de um artigo) se repetir, vale a última
+    ocorrência: nos documentos compilados a redação vigente vem logo após a anterior
+    ("Art. 12 Perderá o mandato o membro ... Art. 12 Perderá o mandato o(a) membro(a) ...
+    (Redação dada pela Resolução ...)").
+    Formato persistido (JSON):
+        {"versao": 3, "artigos": {"42": {"titulo": "Art. 42º", "posicao": 17, "pagina": 12,
+                                          "paragrafos": {"1": {"posicao": 2, "pagina": 12},
+                                                         "1.ii": {"posicao": 4, "pagina": 12}}}}}
+    """
+
+    def __init__(self, artigos: dict = None):
+        self.artigos = artigos if artigos is not None else {}
+        self._current = None
+        self._current_paragraph = None
+
+    @classmethod
+    def from_estrutura(cls, estrutura: list) -> "CitationIndex":
+        """
+        Monta o índice a partir de uma "estrutura" pronta (ex: a do documento final, depois
+        de deduplicação e integração de tabelas). A estrutura não guarda a página do rótulo
+        "Art.", então a página de cada artigo é a do seu primeiro parágrafo: igual à do
+        índice montado por detect_structure quando o artigo tem texto próprio, mas, num
+        artigo sem texto após o rótulo, é a do parágrafo seguinte (que pode estar na
+        página seguinte à do rótulo).
+        """
+        index = cls()
+        for posicao, item in enumerate(estrutura):
+            if item.get("tipo") != "artigo":
+                continue
+            paragrafos = item.get("paragrafos", [])
+            index.add_article(item.get("titulo"), posicao, paragrafos[0].get("pagina") if paragrafos else None)
+            for i, paragrafo in enumerate(paragrafos):
+                if paragrafo.get("numero"):
+                    index.add_paragraph(paragrafo["numero"], i, paragrafo.get("pagina"))
+        return index
+
+    def add_article(self, titulo: str, posicao: int, pagina) -> None:
+        """Registra um artigo (chamado por detect_structure ao abrir cada artigo)."""
+        key = citation_key(titulo)
+        self._current_paragraph = None
+        if key is None:
+            self._current = None
+            return
+        # Repetição (nova redação do artigo): substitui a ocorrência anterior
+        self._current = {"titulo": titulo, "posicao": posicao, "pagina": pagina, "paragrafos": {}}
+        self.artigos[key] = self._current
+
+    def add_paragraph(self, numero: str, posicao: int, pagina) -> None:
+        """
+        Registra um parágrafo/inciso numerado do artigo aberto por último. Um inciso é
+        chaveado sob o último parágrafo (§) registrado no artigo, se houver.
+        """
+        if self._current is None:
+            return
+        if _is_paragraph_label(numero):
+            key = paragraph_key(numero)
+            self._current_paragraph = numero
+        else:
+            key = paragraph_key(self._current_paragraph, numero)
+        if key is not None:
+            self._current["paragrafos"][key] = {"posicao": posicao, "pagina": pagina}
+
+    def lookup(self, artigo, paragrafo=None, inciso=None) -> dict:
+        """
+        Retorna a entrada do artigo (ou do parágrafo/inciso, se informado) ou None.
+        Aceita rótulos ("Art. 42", "§ 1º", "único", "IV") ou números; sem paragrafo, o
+        inciso é o do caput do artigo.
+        """
+        entry = self.artigos.get(citation_key(artigo))
+        if entry is None or (paragrafo is None and inciso is None):
+            return entry
+        return entry["paragrafos"].get(paragraph_key(paragrafo, inciso))
+
+    def resolve(self, estrutura: list, artigo, paragrafo=None, inciso=None):
+        """
+        Retorna o item de "estrutura" citado (o artigo ou o dict do parágrafo/inciso) ou None.
+        Confere o título do artigo, então um índice desatualizado nunca devolve outro trecho.
+        """
+        entry = self.artigos.get(citation_key(artigo))
+        if entry is None or not 0 <= entry["posicao"] < len(estrutura):
+            return None
+        article = estrutura[entry["posicao"]]
+        if article.get("titulo") != entry["titulo"]:
+            return None
+        if paragrafo is None and inciso is None:
+            return article
+        paragraph_entry = entry["paragrafos"].get(paragraph_key(paragrafo, inciso))
+        if paragraph_entry is None:
+            return None
+        paragrafos = article.get("paragrafos", [])
+        if not 0 <= paragraph_entry["posicao"] < len(paragrafos):
+            return None
+        return paragrafos[paragraph_entry["posicao"]]
+
+    def remap_positions(self, position_map: dict) -> None:
+        """Atualiza as posições dos artigos após a estrutura ser reorganizada (antiga -> nova)."""
+        for entry in self.artigos.values():
+            if entry["posicao"] in position_map:
+                entry["posicao"] = position_map[entry["posicao"]]
+
+    def to_dict(self) -> dict:
+        return {"versao": INDEX_VERSION, "artigos": self.artigos}
+
+    def save(self, path: str) -> None:
+        """Grava o índice em JSON de forma atômica (arquivo temporário + os.replace)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "CitationIndex":
+        """Carrega um índice salvo; lança ValueError se for de outra versão do formato."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("versao") != INDEX_VERSION:
+            raise ValueError(f"Índice de citações '{path}' em formato desconhecido: {data.get('versao')}")
+        return cls(data.get("artigos", {}))
+
+def other_article_labels(text: str, artigo) -> list:
+    """
+    Rótulos de outros artigos ("Art. 43") presentes no texto de um trecho resolvido para
+    o artigo citado. Se houver algum, o trecho engloba mais de um artigo (estrutura mal
+    segmentada) e não deve ser usado como resposta exata.
+    """
+    key = citation_key(artigo)
+    return [match.group(0) for match in _ARTICLE_LABEL.finditer(text) if citation_key(match.group(1)) != key]
+
+def parse_citation(text: str) -> tuple:
+    """
+    Extrai a citação de uma pergunta em texto livre: "o que diz o Art. 42, § 1º, inciso II
+    do Regimento" -> ("42", "1", "ii"). Parágrafo e inciso são None quando não citados;
+    retorna (None, None, None) se não houver artigo citado.
+    """
+    match_artigo = _ARTICLE_CITATION.search(text)
+    if not match_artigo:
+        return None, None, None
+    match_paragrafo = _PARAGRAPH_CITATION.search(text)
+    paragrafo = None
+    if match_paragrafo:
+        paragrafo = citation_key(next(g for g in match_paragrafo.groups() if g))
+    match_inciso = _INCISO_CITATION.search(text)
+    inciso = citation_key(match_inciso.group(1)) if match_inciso else None
+    return citation_key(match_artigo.group(1)), paragrafo, inciso
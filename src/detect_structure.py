@@ -2,78 +2,190 @@ import re
 import json
 import pdfplumber
 from pathlib import Path
+from typing import Iterable, Iterator
+from citation_index import CitationIndex
 
-def detect_structure(pdf_path: str, text_blocks: list[dict], metadata: dict = None) -> dict:
+# Tabela de regras de classificação de blocos, em ordem de prioridade: (nome, padrão).
+# Cada padrão tem os grupos <nome>_rotulo (artigo/parágrafo/inciso) e <nome>_texto (restante).
+STRUCTURE_RULES = (
+    # Artigos: "Art. 5º ...", "Art. 5° ...", "Art. 80-D. ...", "art 12 ..."
+    ("artigo", r"(?P<artigo_rotulo>art\.?\s*\d+(?:-[a-z]\b)?[º°]?)\.?(?P<artigo_texto>.*)"),
+    # Parágrafos numerados ou incisos: "§ 1º ...", "§ 2° ...", "Parágrafo único ...", "IV - ..."
+    ("paragrafo", r"(?P<paragrafo_rotulo>§\s*\d+[º°]?|parágrafo único|\b[ivxlcdm]+\s*[-–—])\.?\s*(?P<paragrafo_texto>.*)"),
+)
+
+# As regras são reunidas numa única regex compilada: cada bloco é classificado numa só
+# tentativa de match, e o primeiro ramo que casa vence (mesma prioridade da tabela).
+_BLOCK_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in STRUCTURE_RULES),
+    re.IGNORECASE
+)
+
+# Inícios de artigo, parágrafo ou inciso no meio de um bloco (o extract_raw gera blocos do
+# tamanho de uma página, com vários artigos). "Art." maiúsculo abre um artigo em qualquer
+# ponto (citações no texto usam "art."); "§", "Parágrafo único" e incisos só depois de
+# pontuação (".", ";", ":", ")"), para não cortar citações como "no § 2º do art. 8º".
+# O corte é no espaço simples com que o extract_raw junta palavras e linhas: começar
+# pelo espaço literal (e filtrar pelo 1º caractere do rótulo) deixa a busca ~8x mais
+# rápida que "\s+" seguido dos lookaheads.
+_INLINE_BOUNDARY = re.compile(
+    r" (?=[AP§IVXLCDM])"
+    r"(?:(?=Art\.?\s*\d)|(?<=[.;:)] )(?=§\s*\d|Parágrafo único|[IVXLCDM]+\s*[-–—]))"
+)
+
+def split_block_text(text: str) -> list[str]:
     """
-    Detecta a estrutura de um documento PDF e retorna um JSON padrão.
-    Parágrafos que não são artigos recebem título como null.
+    Divide o texto de um bloco nos inícios de artigo/parágrafo/inciso que aparecem no meio
+    dele: "... 2021) Art. 43. Os campi ... § 1° O ..." -> ["... 2021)", "Art. 43. Os campi ...", "§ 1° O ..."].
     """
-    metadata = metadata or {}
-    doc_id = metadata.get("doc_id", "")
-    nome_doc = metadata.get("nome_doc", Path(pdf_path).stem if isinstance(pdf_path, (str, Path)) else str(pdf_path))
-    versao = metadata.get("versao", "1.0")
-    data_publicacao = metadata.get("data_publicacao", "")
-    pagina_inicial = metadata.get("pagina_inicial", 1)
-    pagina_final = metadata.get("pagina_final", len(text_blocks))
+    return _INLINE_BOUNDARY.split(text)
 
-    structure = {
-        "doc_id": doc_id,
-        "nome_doc": nome_doc,
-        "versao": versao,
-        "data_publicacao": data_publicacao,
-        "pagina_inicial": pagina_inicial,
-        "pagina_final": pagina_final,
-        "estrutura": []
-    }
+def _iter_segments(text_blocks: Iterable[dict], block_count: list) -> Iterator[tuple]:
+    """Gera (trecho, página) de cada bloco dividido por split_block_text; conta os blocos em block_count[0]."""
+    for block in text_blocks:
+        block_count[0] += 1
+        for segment in split_block_text(block["text"]):
+            yield segment, block["page"]
 
+def _classify_line(line: str) -> tuple:
+    """Retorna (regra, rótulo, texto) do bloco; linhas sem regra são ("texto", None, line)."""
+    match = _BLOCK_PATTERN.match(line)
+    if match is None:
+        return "texto", None, line
+    rule = match.lastgroup
+    return rule, match.group(f"{rule}_rotulo"), match.group(f"{rule}_texto")
+
+def iter_structure(text_blocks: Iterable[dict], stats: dict = None,
+                   citation_index: CitationIndex = None) -> Iterator[dict]:
+    """
+    Versão em streaming de detect_structure: gera os itens de "estrutura" à medida que
+    ficam completos, na mesma ordem da lista devolvida por detect_structure.
+
+    Um artigo é gerado quando o próximo "Art." começa (ou ao fim da entrada), já com todos
+    os seus parágrafos; parágrafos soltos (antes do primeiro artigo) são gerados na hora.
+    Só o artigo corrente fica em memória, então a função pode ser encadeada após
+    extract_raw.iter_text_blocks e alimentar deduplicação/escrita de JSONL sem esperar
+    o documento inteiro.
+
+    Se stats (dict) for passado, recebe "rule_hits" (trechos por regra de STRUCTURE_RULES,
+    "texto" e "vazio"), atualizado durante a iteração, e "n_blocks" (blocos de entrada) ao final.
+    Com citation_index, cada artigo e parágrafo/inciso numerado é registrado no índice
+    de citações (posição na estrutura e página) à medida que aparece.
+    """
+    rule_hits = {name: 0 for name, _ in STRUCTURE_RULES}
+    rule_hits.update(texto=0, vazio=0)
+    if stats is not None:
+        stats["rule_hits"] = rule_hits
     current_article = None
+    block_count = [0]
+    # Posição do próximo item em "estrutura" (itens são gerados na ordem da lista)
+    position = 0
 
-    for block in text_blocks:
-        line = block["text"].strip()
-        page_num = block["page"]
+    # Cada bloco é dividido nos artigos/parágrafos/incisos que começam no meio dele
+    for segment, page_num in _iter_segments(text_blocks, block_count):
+        line = segment.strip()
 
         if not line:
+            rule_hits["vazio"] += 1
             continue
 
+        rule, label, text = _classify_line(line)
+        rule_hits[rule] += 1
+
         # Detecta artigos
-        match_artigo = re.match(r"^(art\.?\s*\d+º?)(.*)", line, re.IGNORECASE)
-        if match_artigo:
-            artigo_titulo = match_artigo.group(1).capitalize()
-            artigo_texto = match_artigo.group(2).strip()
+        if rule == "artigo":
+            # O artigo anterior está completo
+            if current_article:
+                yield current_article
+                position += 1
+            artigo_titulo = label.capitalize()
+            artigo_texto = text.strip()
             new_article = {"tipo": "artigo", "titulo": artigo_titulo, "paragrafos": []}
             if artigo_texto:
                 new_article["paragrafos"].append({"numero": None, "texto": artigo_texto, "pagina": page_num})
-            structure["estrutura"].append(new_article)
             current_article = new_article
+            if citation_index is not None:
+                citation_index.add_article(artigo_titulo, position, page_num)
             continue
 
         # Detecta parágrafos numerados ou incisos
-        match_paragrafo = re.match(r"^(§\s*\d+º|parágrafo único|\b[ivxlcdm]+\s*[-–—])\s*(.*)", line, re.IGNORECASE)
-        if match_paragrafo:
-            paragraph_number = match_paragrafo.group(1).strip()
-            paragraph_text = match_paragrafo.group(2).strip()
+        if rule == "paragrafo":
+            paragraph_number = label.strip()
+            paragraph_text = text.strip()
             if current_article:
                 current_article["paragrafos"].append({"numero": paragraph_number, "texto": paragraph_text, "pagina": page_num})
+                if citation_index is not None:
+                    citation_index.add_paragraph(paragraph_number, len(current_article["paragrafos"]) - 1, page_num)
             else:
-                structure["estrutura"].append({
+                position += 1
+                yield {
                     "tipo": "paragrafo",
                     "titulo": None,
                     "numero": paragraph_number,
                     "texto": paragraph_text,
                     "pagina": page_num
-                })
+                }
             continue
 
         # Qualquer outro texto que não seja artigo ou parágrafo numerado
         if current_article:
             current_article["paragrafos"].append({"numero": None, "texto": line, "pagina": page_num})
         else:
-            structure["estrutura"].append({
+            position += 1
+            yield {
                 "tipo": "paragrafo",
                 "titulo": None,
                 "numero": None,
                 "texto": line,
                 "pagina": page_num
-            })
+            }
+
+    if current_article:
+        yield current_article
+    if stats is not None:
+        stats["n_blocks"] = block_count[0]
+
+def detect_structure(pdf_path: str, text_blocks: Iterable[dict], metadata: dict = None,
+                     stats: dict = None, citation_index: CitationIndex = None) -> dict:
+    """
+    Detecta a estrutura de um documento PDF e retorna um JSON padrão.
+    Parágrafos que não são artigos recebem título como null.
+    text_blocks pode ser uma lista ou um iterador (ex: extract_raw.iter_text_blocks),
+    consumido uma única vez.
+
+    Cada bloco é dividido nos artigos/parágrafos/incisos que começam no meio dele
+    (split_block_text) e cada trecho é classificado pelas regras de STRUCTURE_RULES (uma
+    regex compilada). Se stats (dict) for passado, recebe em "rule_hits" quantos trechos
+    caíram em cada regra ("artigo", "paragrafo", "texto" e "vazio") e em "n_blocks" o total de blocos.
+    Para consumir os artigos à medida que ficam prontos, use iter_structure.
+
+    Se citation_index (citation_index.CitationIndex) for passado, é preenchido com o
+    número de cada artigo e de seus parágrafos/incisos -> posição em "estrutura" e página,
+    para resolver citações exatas (ex: "Art. 42, § 1º") sem busca semântica.
+    """
+    metadata = metadata or {}
+    doc_id = metadata.get("doc_id", "")
+    nome_doc = metadata.get("nome_doc", Path(pdf_path).stem if isinstance(pdf_path, (str, Path)) else str(pdf_path))
+    versao = metadata.get("versao", "1.0")
+    data_publicacao = metadata.get("data_publicacao", "")
+    pagina_inicial = metadata.get("pagina_inicial", 1)
+    # Sem "pagina_final" nos metadados, usa a contagem de blocos (calculada ao final para iteradores)
+    pagina_final = metadata.get("pagina_final")
+
+    structure = {
+        "doc_id": doc_id,
+        "nome_doc": nome_doc,
+        "versao": versao,
+        "data_publicacao": data_publicacao,
+        "pagina_inicial": pagina_inicial,
+        "pagina_final": pagina_final,
+        "estrutura": []
+    }
+
+    run_stats = stats if stats is not None else {}
+    structure["estrutura"] = list(iter_structure(text_blocks, run_stats, citation_index))
+
+    if "pagina_final" not in metadata:
+        structure["pagina_final"] = run_stats["n_blocks"]
 
     return structure
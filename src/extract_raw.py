@@ -1,143 +1,494 @@
 import re
 import pdfplumber
+from pathlib import Path
+from bisect import bisect_left, bisect_right
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from page_cache import PageCache, file_sha256
+from memory_usage import RSSTracker
 
-def _reconstruct_lines_from_words(page, x_tol=3, y_tol=3):
-    """
-    Fallback: reconstrói linhas agrupando words por proximidade vertical (y0).
-    Retorna lista de linhas já ordenadas left-to-right, top-to-bottom.
+try:
+    import fitz  # PyMuPDF (backend opcional, mais rápido por página)
+except ImportError:
+    fitz = None
+
+BACKENDS = ("pdfplumber", "pymupdf")
+
+# Tolerâncias de agrupamento de caracteres/linhas (também fazem parte da chave do cache de páginas)
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+def _cluster_words_into_positioned_lines(words: list[dict], y_tol: float = 3) -> list[tuple]:
     """
-    words = page.extract_words()
-    if not words:
-        return []
+    Agrupa words em linhas por proximidade vertical e retorna (top, bottom, texto) de cada
+    linha, ordenadas top-to-bottom, com as palavras left-to-right. top é o y de referência
+    da linha e bottom o maior 'bottom' das suas words (ou top, se elas não o tiverem).
 
-    # Agrupa por "linha" usando aproximação de y0
-    lines_map = []  # lista de (y_mid, [words])
+    Semântica (inalterada): cada word entra na PRIMEIRA linha criada cujo y de referência
+    (o 'top' da word que a criou) esteja a no máximo y_tol; se nenhuma servir, cria uma linha.
+    Como duas referências distam sempre mais que y_tol, no máximo duas linhas cabem na
+    janela [y - y_tol, y + y_tol]. As referências ficam ordenadas, então a busca de cada
+    word custa O(log L) (bisect) em vez de comparar com todas as L linhas. A inserção de
+    uma linha nova na lista ordenada ainda desloca O(L) elementos, o que dá O(n log L + L²)
+    no pior caso; como L (linhas de uma página) é pequeno e o deslocamento é um memmove,
+    o custo fica dominado pela busca.
+    """
+    ref_ys = []       # y de referência das linhas, em ordem crescente
+    ref_lines = []    # [ordem_de_criacao, bottom, [(x, text)]] alinhado com ref_ys
     for w in words:
         # cada word tem 'top' e 'bottom' (ou 'doctop'), usar 'top' se disponível
         y = float(w.get("top") or w.get("doctop") or 0)
+        bottom = float(w.get("bottom") or y)
         x = float(w.get("x0") or 0)
         text = w.get("text", "")
 
-        placed = False
-        for idx, (y_ref, items) in enumerate(lines_map):
-            if abs(y_ref - y) <= y_tol:
-                items.append((x, text))
-                placed = True
-                break
-        if not placed:
-            lines_map.append((y, [(x, text)]))
-
-    # Ordena linhas top -> bottom (menor y -> topo) e palavras left->right
-    lines_map.sort(key=lambda p: p[0])
+        # Janela levemente alargada; o teste abs() abaixo mantém o critério exato original
+        lo = bisect_left(ref_ys, y - y_tol - 1e-9)
+        hi = bisect_right(ref_ys, y + y_tol + 1e-9)
+        candidates = [i for i in range(lo, hi) if abs(ref_ys[i] - y) <= y_tol]
+        if candidates:
+            # Entre as candidatas (no máximo 2), vence a criada primeiro
+            best = ref_lines[min(candidates, key=lambda i: ref_lines[i][0])]
+            best[1] = max(best[1], bottom)
+            best[2].append((x, text))
+        else:
+            pos = bisect_left(ref_ys, y)
+            ref_ys.insert(pos, y)
+            ref_lines.insert(pos, [len(ref_ys), bottom, [(x, text)]])
+
+    # ref_ys já está ordenado top -> bottom; ordena as palavras left->right
     lines = []
-    for _, items in lines_map:
+    for top, (_, bottom, items) in zip(ref_ys, ref_lines):
         items.sort(key=lambda it: it[0])
         line = " ".join(t for _, t in items).strip()
         if line:
-            lines.append(line)
+            lines.append((top, bottom, line))
     return lines
 
-def extract_raw(pdf_path: str, header_height_ratio: float = 0.15, footer_height_ratio: float = 0.12) -> list[dict]:
+def _cluster_words_into_lines(words: list[dict], y_tol: float = 3) -> list[str]:
+    """Como _cluster_words_into_positioned_lines, mas só com o texto de cada linha."""
+    return [line for _, _, line in _cluster_words_into_positioned_lines(words, y_tol=y_tol)]
+
+def _page_lines(page) -> list[tuple]:
+    """
+    Extrai as linhas não vazias da página inteira como (top, bottom, texto), num único
+    layout (extract_text_lines), recorrendo ao agrupamento de words por proximidade
+    vertical quando o pdfplumber não devolve texto.
+    """
+    lines = [
+        (ln["top"], ln["bottom"], ln["text"].strip())
+        for ln in page.extract_text_lines(x_tolerance=X_TOLERANCE, y_tolerance=Y_TOLERANCE, return_chars=False)
+        if ln["text"] and ln["text"].strip()
+    ]
+    if lines:
+        return lines
+    # Fallback: reconstrói linhas agrupando words por proximidade vertical (top)
+    words = page.extract_words()
+    if not words:
+        return []
+    return _cluster_words_into_positioned_lines(words, y_tol=Y_TOLERANCE)
+
+def _fitz_page_lines(page, y_tol=Y_TOLERANCE) -> list[tuple]:
+    """
+    Equivalente de _page_lines para PyMuPDF, a partir de page.get_text("dict").
+    As linhas do fitz que compartilham a mesma altura (ex: colunas de uma tabela) são
+    reunidas com o mesmo critério de y_tol usado no fallback do pdfplumber.
+    """
+    text_dict = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+    fitz_lines = []
+    for block in text_dict.get("blocks", []):
+        if block.get("type", 0) != 0:
+            continue
+        for line in block.get("lines", []):
+            text = " ".join("".join(span.get("text", "") for span in line.get("spans", [])).split())
+            if text:
+                x0, top, _, bottom = line["bbox"]
+                fitz_lines.append({"text": text, "top": top, "bottom": bottom, "x0": x0})
+    return _cluster_words_into_positioned_lines(fitz_lines, y_tol=y_tol)
+
+def _open_pdf(pdf_path: str, backend: str):
+    """Abre o PDF com o backend escolhido (ambos funcionam como context manager)."""
+    if backend == "pymupdf":
+        return fitz.open(pdf_path)
+    return pdfplumber.open(pdf_path)
+
+def _pdf_pages(pdf, backend: str):
+    """Sequência indexável das páginas do documento aberto."""
+    return pdf if backend == "pymupdf" else pdf.pages
+
+def _page_layout(page, header_height_ratio: float, footer_height_ratio: float,
+                 backend: str = "pdfplumber") -> dict:
+    """
+    Faz o layout da página UMA vez e devolve tudo o que as duas passadas precisam:
+    {"lines": linhas da área de conteúdo, "first": 1ª linha, "last": última linha}.
+    "first"/"last" (None numa página sem texto) são os candidatos a cabeçalho/rodapé;
+    "lines" são as linhas que cruzam a faixa vertical da área de conteúdo
+    [altura * header_height_ratio, altura * (1 - footer_height_ratio)].
+    """
+    if backend == "pymupdf":
+        rect = page.rect
+        lines = _fitz_page_lines(page)
+        y0, height = rect.y0, rect.height
+    else:
+        lines = _page_lines(page)
+        y0, height = 0, page.height
+
+    content_top = y0 + height * header_height_ratio
+    content_bottom = y0 + height * (1 - footer_height_ratio)
+    return {
+        "lines": [text for top, bottom, text in lines if bottom >= content_top and top <= content_bottom],
+        "first": lines[0][2] if lines else None,
+        "last": lines[-1][2] if lines else None,
+    }
+
+def _resolve_backend(backend: str) -> str:
+    """Valida o backend; sem PyMuPDF instalado, volta para o pdfplumber."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido '{backend}'. Opções: {', '.join(BACKENDS)}")
+    if backend == "pymupdf" and fitz is None:
+        print("⚠️ PyMuPDF (fitz) não está instalado. Usando o backend 'pdfplumber'.")
+        return "pdfplumber"
+    return backend
+
+def _make_page_cache(pdf_path: str, cache_dir: str, backend: str, header_height_ratio: float,
+                     footer_height_ratio: float, cache_max_bytes: int) -> tuple:
+    """
+    Prepara o cache de páginas do documento: retorna (cache, cache_key), ou (None, None)
+    se o cache estiver desativado ou indisponível. A chave base combina o hash do
+    conteúdo do PDF, o backend e os parâmetros que alteram o texto extraído.
+    """
+    if not cache_dir:
+        return None, None
+    try:
+        file_hash = file_sha256(pdf_path)
+    except OSError as e:
+        print(f"⚠️ Cache de páginas desativado para '{pdf_path}': {e}")
+        return None, None
+    cache_key = {
+        "file_hash": file_hash,
+        "backend": backend,
+        "x_tolerance": X_TOLERANCE,
+        "y_tolerance": Y_TOLERANCE,
+        "header_height_ratio": header_height_ratio,
+        "footer_height_ratio": footer_height_ratio,
+    }
+    return PageCache(cache_dir, max_bytes=cache_max_bytes), cache_key
+
+def _cached_layout(cache, cache_key: dict, page_index: int, compute) -> dict:
+    """Busca o layout de uma página (ver _page_layout) no cache; calcula e grava se ausente."""
+    if cache is None:
+        return compute()
+    key = {**cache_key, "page": page_index, "kind": "layout"}
+    layout = cache.get(key)
+    if not (isinstance(layout, dict) and isinstance(layout.get("lines"), list)):
+        layout = compute()
+        cache.put(key, layout)
+    return layout
+
+def _release_page(page, backend: str) -> None:
+    """
+    Libera os caches de uma página já processada (modo low_memory). O pdfplumber guarda
+    chars/objetos/layout de cada página no objeto Page, que fica vivo em pdf.pages até o
+    fim do documento; no PyMuPDF, esvazia o store de recursos decodificados.
+    """
+    if backend == "pymupdf":
+        fitz.TOOLS.store_shrink(100)
+    else:
+        page.close()
+
+def _make_page_releaser(backend: str, low_memory: bool, tracker: RSSTracker = None):
+    """
+    Callback chamado após cada página: amostra o RSS e, se low_memory, libera os caches.
+    A amostra vem antes da liberação para que o pico inclua o layout da página.
+    """
+    if not low_memory and tracker is None:
+        return None
+
+    def release(page):
+        if tracker is not None:
+            tracker.sample()
+        if low_memory:
+            _release_page(page, backend)
+    return release
+
+def _detect_header_footer(pdf, header_height_ratio: float, footer_height_ratio: float,
+                          backend: str = "pdfplumber", cache=None, cache_key: dict = None,
+                          release=None) -> tuple:
+    """
+    1ª passada: coleta possíveis cabeçalhos/rodapés (até 10 páginas) e
+    retorna (common_header, common_footer, content_lines); header/footer são None se não
+    se repetirem >2 vezes.
+
+    Cada página passa por um único layout (_page_layout): os candidatos saem da primeira e
+    da última linha da página inteira e as linhas da área de conteúdo, filtradas da mesma
+    saída, são devolvidas em content_lines ({page_index: linhas}) para que a 2ª passada
+    não processe essas páginas de novo.
+    """
+    header_candidates = []
+    footer_candidates = []
+    content_lines = {}
+    pages = _pdf_pages(pdf, backend)
+    for page_index in range(min(len(pages), 10)):
+        page = pages[page_index]
+        layout = _cached_layout(
+            cache, cache_key, page_index,
+            lambda: _page_layout(page, header_height_ratio, footer_height_ratio, backend)
+        )
+        content_lines[page_index] = layout["lines"]
+        if release is not None:
+            release(page)
+        if layout["first"] is None:
+            continue
+        header_candidates.append(layout["first"])
+        footer_candidates.append(layout["last"])
+
+    # Detecta os mais comuns (apenas se aparecerem >2 vezes)
+    common_header = None
+    common_footer = None
+    if header_candidates:
+        header_count = Counter(header_candidates).most_common(1)
+        if header_count and header_count[0][1] > 2:
+            common_header = header_count[0][0]
+    if footer_candidates:
+        footer_count = Counter(footer_candidates).most_common(1)
+        if footer_count and footer_count[0][1] > 2:
+            common_footer = footer_count[0][0]
+    return common_header, common_footer, content_lines
+
+def _lines_to_blocks(lines: list[str], page_num: int, common_header: str = None,
+                     common_footer: str = None) -> list[dict]:
+    """
+    2ª passada para UMA página: remove cabeçalho/rodapé repetidos das linhas de conteúdo
+    e as segmenta em blocos.
+    """
+    # Remove cabeçalho/rodapé detectados (comparação por prefixo)
+    if common_header and lines and lines[0].startswith(common_header[:15]):
+        lines = lines[1:]
+    if common_footer and lines and lines[-1].startswith(common_footer[:15]):
+        lines = lines[:-1]
+
+    if not lines:
+        return []
+
+    # Junta linhas em um único texto para aplicar heurística semântica depois
+    page_text_clean = " ".join(lines)
+
+    # Heurística de parágrafos (divide por sentence boundaries + conectores comuns)
+    paragraph_candidates = re.split(
+        r'\.\n|(?=\b(Diante|Além disso|Assim|Portanto|Os números|Com base|Em seguida|Dessa forma|Por fim|Ciente|Dando continuidade)\b)',
+        page_text_clean
+        )
+
+    # Filtra e adiciona blocos robustos
+    blocks = []
+    for para in paragraph_candidates:
+        if not para:
+            continue
+        para = para.strip()
+        # elimina strings muito curtas (p. ex. letras soltas) — ajuste conforme necessidade
+        if len(para) < 30:
+            # se for título curto em maiúsculas, ainda pode ser útil
+            if para.isupper() and len(para) > 5:
+                pass
+            else:
+                continue
+        blocks.append({
+            "text": para,
+            "page": page_num
+        })
+    return blocks
+
+def _extract_page_blocks(page, page_num: int, header_height_ratio: float, footer_height_ratio: float,
+                         common_header: str = None, common_footer: str = None,
+                         backend: str = "pdfplumber", cache=None, cache_key: dict = None) -> list[dict]:
+    """
+    2ª passada para UMA página: linhas da área de conteúdo (sem as faixas de cabeçalho/rodapé) e segmentação em blocos.
+    """
+    layout = _cached_layout(
+        cache, cache_key, page_num - 1,
+        lambda: _page_layout(page, header_height_ratio, footer_height_ratio, backend)
+    )
+    return _lines_to_blocks(layout["lines"], page_num, common_header, common_footer)
+
+def _extract_page_range(args: tuple) -> tuple[list[dict], float]:
+    """
+    Worker do modo paralelo: abre o PDF no próprio processo e extrai os blocos
+    das páginas [start, stop) com o cabeçalho/rodapé já detectados.
+    Retorna (blocos, pico de RSS do worker em MB).
+    """
+    (pdf_path, start, stop, header_height_ratio, footer_height_ratio,
+     common_header, common_footer, backend, cache, cache_key, low_memory) = args
+    tracker = RSSTracker()
+    release = _make_page_releaser(backend, low_memory, tracker)
+    blocks = []
+    with _open_pdf(pdf_path, backend) as pdf:
+        pages = _pdf_pages(pdf, backend)
+        for page_index in range(start, stop):
+            page = pages[page_index]
+            blocks.extend(_extract_page_blocks(
+                page, page_index + 1,
+                header_height_ratio, footer_height_ratio,
+                common_header, common_footer, backend, cache, cache_key
+            ))
+            release(page)
+    return blocks, tracker.peak_mb
+
+def _split_page_range(n_pages: int, n_chunks: int) -> list[tuple[int, int]]:
+    """Divide range(n_pages) em até n_chunks intervalos contíguos [start, stop)."""
+    if n_pages <= 0:
+        return []
+    n_chunks = max(1, min(n_chunks, n_pages))
+    size, extra = divmod(n_pages, n_chunks)
+    ranges = []
+    start = 0
+    for i in range(n_chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def _iter_text_blocks(pdf_path: str, header_height_ratio: float, footer_height_ratio: float,
+                      backend: str = "pdfplumber", cache=None, cache_key: dict = None,
+                      release=None):
+    """Núcleo do modo serial: gera os blocos página a página, sem tratar exceções."""
+    with _open_pdf(pdf_path, backend) as pdf:
+        common_header, common_footer, content_lines = _detect_header_footer(
+            pdf, header_height_ratio, footer_height_ratio, backend, cache, cache_key, release
+        )
+        for page_num, page in enumerate(_pdf_pages(pdf, backend), 1):
+            # Páginas da 1ª passada já têm as linhas de conteúdo extraídas
+            lines = content_lines.pop(page_num - 1, None)
+            if lines is None:
+                lines = _cached_layout(
+                    cache, cache_key, page_num - 1,
+                    lambda: _page_layout(page, header_height_ratio, footer_height_ratio, backend)
+                )["lines"]
+                if release is not None:
+                    release(page)
+            yield from _lines_to_blocks(lines, page_num, common_header, common_footer)
+
+def _report_memory(pdf_path: str, tracker: RSSTracker, low_memory: bool, stats: dict = None) -> None:
+    """Registra o pico de RSS do documento em stats e, no modo low_memory, imprime o relatório."""
+    if stats is not None:
+        stats["start_rss_mb"] = round(tracker.start_mb, 1)
+        stats["peak_rss_mb"] = round(tracker.peak_mb, 1)
+    if low_memory:
+        print(f"   [extract_raw] Pico de RSS em '{Path(pdf_path).name}': {tracker.peak_mb:.0f} MB "
+              f"(início: {tracker.start_mb:.0f} MB)")
+
+def iter_text_blocks(pdf_path: str, header_height_ratio: float = 0.15, footer_height_ratio: float = 0.12,
+                     backend: str = "pdfplumber", cache_dir: str = None,
+                     cache_max_bytes: int = 256 * 1024 * 1024, low_memory: bool = False,
+                     stats: dict = None):
+    """
+    Versão em streaming de extract_raw: gera blocos {"text", "page"} página a página.
+    Apenas as páginas usadas na detecção de cabeçalho/rodapé são lidas antes do primeiro
+    bloco; o restante é extraído sob demanda, mantendo a memória limitada em documentos longos.
+    Em caso de erro, a mensagem é impressa e a exceção é propagada ao consumidor (os blocos
+    já gerados permanecem válidos; quem consome o gerador decide se segue para o próximo
+    documento). extract_raw, ao contrário, retorna [] para o documento com erro. O cache e o
+    relatório de memória são finalizados mesmo assim, inclusive se o consumidor abandonar
+    o gerador antes do fim.
+    low_memory e stats funcionam como em extract_raw.
+    """
+    backend = _resolve_backend(backend)
+    cache, cache_key = _make_page_cache(
+        pdf_path, cache_dir, backend, header_height_ratio, footer_height_ratio, cache_max_bytes
+    )
+    tracker = RSSTracker() if (low_memory or stats is not None) else None
+    release = _make_page_releaser(backend, low_memory, tracker)
+    try:
+        yield from _iter_text_blocks(
+            pdf_path, header_height_ratio, footer_height_ratio, backend, cache, cache_key, release
+        )
+    except Exception as e:
+        print(f"❌ Erro ao processar PDF '{pdf_path}': {e}")
+        raise
+    finally:
+        if cache is not None:
+            cache.evict()
+        if tracker is not None:
+            _report_memory(pdf_path, tracker, low_memory, stats)
+
+def extract_raw(pdf_path: str, header_height_ratio: float = 0.15, footer_height_ratio: float = 0.12,
+                workers: int = 1, backend: str = "pdfplumber", cache_dir: str = None,
+                cache_max_bytes: int = 256 * 1024 * 1024, low_memory: bool = False,
+                stats: dict = None) -> list[dict]:
     """
     Extrai texto bruto de um PDF, removendo cabeçalhos e rodapés e segmentando em blocos (parágrafos).
     Possui fallback robusto caso page.extract_text retorne None.
+
+    Com workers > 1, as páginas são divididas em intervalos processados por um pool de
+    processos (cada worker abre o PDF por conta própria). A detecção de cabeçalho/rodapé
+    roda uma única vez antes e os blocos são reunidos na ordem das páginas, de modo que
+    o resultado é idêntico ao do modo serial.
+
+    backend="pymupdf" usa page.get_text("dict") do PyMuPDF (bem mais rápido por página),
+    com o mesmo esquema de blocos e as mesmas proporções de recorte; o padrão continua
+    sendo o pdfplumber, que também é usado se o PyMuPDF não estiver disponível.
+
+    Com cache_dir, as linhas extraídas de cada página ficam num cache em disco (ver
+    page_cache.PageCache) chaveado pelo hash do PDF, página, backend e parâmetros de
+    extração; reexecuções sobre o mesmo arquivo não reprocessam as páginas. O cache é
+    limitado a cache_max_bytes e entradas inválidas são simplesmente recalculadas.
+
+    low_memory=True libera os caches de cada página (chars, objetos, layout) logo após
+    processá-la, em vez de mantê-los até o fim do documento, e imprime o pico de RSS
+    do documento (no modo paralelo, o maior entre o processo principal e os workers).
+    Se stats (dict) for passado, recebe "start_rss_mb" e "peak_rss_mb".
+
+    Em caso de erro, a mensagem é impressa e o retorno é [] (nenhum bloco do documento);
+    a exceção não é propagada. Já iter_text_blocks propaga a exceção ao consumidor.
     """
     all_text_blocks = []
-    header_candidates = []
-    footer_candidates = []
+    backend = _resolve_backend(backend)
+    cache, cache_key = _make_page_cache(
+        pdf_path, cache_dir, backend, header_height_ratio, footer_height_ratio, cache_max_bytes
+    )
+    tracker = RSSTracker() if (low_memory or stats is not None) else None
+    release = _make_page_releaser(backend, low_memory, tracker)
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            n_pages = len(pdf.pages)
-            # 1ª passada: coletar possíveis cabeçalhos/rodapés (até 10 páginas)
-            for page in pdf.pages[:min(n_pages, 10)]:
-                text = page.extract_text(x_tolerance=3, y_tolerance=3) or ""
-                if not text.strip():
-                    # fallback: tenta reconstruir a partir de words
-                    lines_fb = _reconstruct_lines_from_words(page)
-                    if not lines_fb:
-                        continue
-                    lines = lines_fb
-                else:
-                    lines = [ln.strip() for ln in text.split("\n") if ln and ln.strip()]
-
-                if len(lines) < 1:
-                    continue
-                header_candidates.append(lines[0])
-                footer_candidates.append(lines[-1])
-
-            # Detecta os mais comuns (apenas se aparecerem >2 vezes)
-            common_header = None
-            common_footer = None
-            if header_candidates:
-                header_count = Counter(header_candidates).most_common(1)
-                if header_count and header_count[0][1] > 2:
-                    common_header = header_count[0][0]
-            if footer_candidates:
-                footer_count = Counter(footer_candidates).most_common(1)
-                if footer_count and footer_count[0][1] > 2:
-                    common_footer = footer_count[0][0]
-
-            # 2ª passada: extração por página com crop + fallback e segmentação
-            for page_num, page in enumerate(pdf.pages, 1):
-                page_height = page.height
-                page_width = page.width
-
-                content_bbox = (
-                    0,
-                    page_height * header_height_ratio,
-                    page_width,
-                    page_height * (1 - footer_height_ratio)
-                )
-                content_page = page.crop(bbox=content_bbox)
-
-                page_text = content_page.extract_text(x_tolerance=3, y_tolerance=3)
-
-                # Se extract_text retornou None ou vazio, tenta reconstruir por words
-                if not page_text or not page_text.strip():
-                    lines = _reconstruct_lines_from_words(content_page)
-                else:
-                    # split seguro - garantimos page_text ser string
-                    lines = [ln.strip() for ln in page_text.split("\n") if ln and ln.strip()]
-
-                # Remove cabeçalho/rodapé detectados (comparação por prefixo)
-                if common_header and lines and lines[0].startswith(common_header[:15]):
-                    lines = lines[1:]
-                if common_footer and lines and lines[-1].startswith(common_footer[:15]):
-                    lines = lines[:-1]
-
-                if not lines:
-                    continue
-
-                # Junta linhas em um único texto para aplicar heurística semântica depois
-                page_text_clean = " ".join(lines)
-
-                # Heurística de parágrafos (divide por sentence boundaries + conectores comuns)
-                paragraph_candidates = re.split(
-                    r'\.\n|(?=\b(Diante|Além disso|Assim|Portanto|Os números|Com base|Em seguida|Dessa forma|Por fim|Ciente|Dando continuidade)\b)',
-                    page_text_clean
-                    )
-
-                # Filtra e adiciona blocos robustos
-                for para in paragraph_candidates:
-                    if not para:
-                        continue
-                    para = para.strip()
-                    # elimina strings muito curtas (p. ex. letras soltas) — ajuste conforme necessidade
-                    if len(para) < 30:
-                        # se for título curto em maiúsculas, ainda pode ser útil
-                        if para.isupper() and len(para) > 5:
-                            pass
-                        else:
-                            continue
-                    all_text_blocks.append({
-                        "text": para,
-                        "page": page_num
-                    })
+        if workers <= 1:
+            all_text_blocks = list(_iter_text_blocks(
+                pdf_path, header_height_ratio, footer_height_ratio, backend, cache, cache_key, release
+            ))
+            return all_text_blocks
+
+        with _open_pdf(pdf_path, backend) as pdf:
+            n_pages = len(_pdf_pages(pdf, backend))
+            common_header, common_footer, content_lines = _detect_header_footer(
+                pdf, header_height_ratio, footer_height_ratio, backend, cache, cache_key, release
+            )
+
+        # As páginas da 1ª passada já foram extraídas; os workers ficam só com o restante
+        for page_index in sorted(content_lines):
+            all_text_blocks.extend(_lines_to_blocks(
+                content_lines[page_index], page_index + 1, common_header, common_footer
+            ))
+        first_page = len(content_lines)
+
+        # Modo paralelo: vários intervalos por worker para equilibrar páginas lentas
+        tasks = [
+            (pdf_path, first_page + start, first_page + stop,
+             header_height_ratio, footer_height_ratio, common_header, common_footer,
+             backend, cache, cache_key, low_memory)
+            for start, stop in _split_page_range(n_pages - first_page, workers * 4)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # executor.map preserva a ordem dos intervalos -> blocos em ordem de página
+            for blocks, worker_peak_mb in executor.map(_extract_page_range, tasks):
+                all_text_blocks.extend(blocks)
+                if tracker is not None:
+                    tracker.peak_mb = max(tracker.peak_mb, worker_peak_mb)
 
     except Exception as e:
         print(f"❌ Erro ao processar PDF '{pdf_path}': {e}")
         return []
+    finally:
+        if cache is not None:
+            cache.evict()
+        if tracker is not None:
+            _report_memory(pdf_path, tracker, low_memory, stats)
 
     return all_text_blocks
@@ -1,41 +1,374 @@
-import camelot
+import json
+import time
+import hashlib
+from bisect import bisect_left, bisect_right
+
 import pandas as pd
 
-def extract_tables(pdf_path: str) -> list[list[list[str]]]:
+from camelot_pool import read_tables
+
+try:
+    import fitz  # PyMuPDF (pré-triagem das páginas; sem ele o Camelot roda em todas)
+except ImportError:
+    fitz = None
+
+FLAVORS = ("lattice", "stream")
+
+# Parâmetros da pré-triagem (calibrados nos PDFs de data/input: nenhuma página com tabela
+# lattice ficou de fora)
+LINE_SCALE = 15           # linha de tabela: >= 1/15 da largura (ou altura) da página
+THIN = 2.0                # retângulo com lado <= THIN pt é tratado como linha
+MERGE_GAP = 2.0           # segmentos colineares a até MERGE_GAP pt formam uma só linha
+MAX_RULE_GAP = 1 / 6      # réguas empilhadas a até 1/6 da altura (cabeçalho + rodapé não contam)
+MIN_IMAGE_AREA = 0.10     # imagem cobrindo >= 10% da página pode ser uma tabela escaneada
+MIN_COLUMN_GAP = 15       # espaço (pt) entre palavras que separa colunas
+MIN_LABEL_CHARS = 5       # "IV –", "a)": rótulo de inciso seguido de recuo não é coluna
+MIN_TABULAR_ROWS = 3      # linhas de texto em colunas para a página ir ao flavor stream
+
+# Custo médio do Camelot por página (s) medido em data/input; só estima a economia quando
+# nenhuma página do documento passou pelo Camelot no flavor (não há tempo medido para extrapolar)
+REFERENCE_SECONDS_PER_PAGE = {"lattice": 0.5, "stream": 0.05}
+
+# Detecções lattice/stream da mesma página com IoU das bboxes >= este valor são a mesma tabela
+MIN_BBOX_IOU = 0.5
+
+
+def _merge_runs(intervals: list) -> list:
+    """Une intervalos (início, fim) que se tocam ou distam até MERGE_GAP."""
+    intervals = sorted(intervals)
+    runs = [list(intervals[0])]
+    for start, end in intervals[1:]:
+        if start <= runs[-1][1] + MERGE_GAP:
+            runs[-1][1] = max(runs[-1][1], end)
+        else:
+            runs.append([start, end])
+    return runs
+
+
+def _word_boxes(words: list) -> tuple:
+    """Caixas das palavras ordenadas pelo topo, encolhidas 15% na vertical (sublinhados ficam de fora)."""
+    boxes = []
+    for x0, y0, x1, y1, *_ in words:
+        margin = (y1 - y0) * 0.15
+        boxes.append((y0 + margin, y1 - margin, x0, x1))
+    boxes.sort()
+    max_height = max((b[1] - b[0] for b in boxes), default=0)
+    return boxes, [b[0] for b in boxes], max_height
+
+
+def _crosses_text(y: float, x0: float, x1: float, word_boxes: tuple) -> bool:
+    """True se a linha horizontal em y atravessa alguma palavra (tachado/sublinhado, não régua)."""
+    boxes, tops, max_height = word_boxes
+    for top, bottom, wx0, wx1 in boxes[bisect_left(tops, y - max_height):bisect_right(tops, y)]:
+        if top <= y <= bottom and wx0 < x1 and x0 < wx1:
+            return True
+    return False
+
+
+def _page_rules(page, word_boxes: tuple) -> tuple:
+    """
+    Segmentos desenhados na página: ({y: [(x0, x1)]} horizontais, {x: [(y0, y1)]} verticais).
+    Ignora o fundo da página (preenchimento branco sem contorno) e linhas que cortam texto.
+    """
+    horizontal, vertical = {}, {}
+
+    def add_h(y, x0, x1):
+        x0, x1 = min(x0, x1), max(x0, x1)
+        if not _crosses_text(y, x0, x1, word_boxes):
+            horizontal.setdefault(round(y), []).append((x0, x1))
+
+    def add_v(x, y0, y1):
+        vertical.setdefault(round(x), []).append((min(y0, y1), max(y0, y1)))
+
+    for path in page.get_drawings():
+        if path.get("color") is None and path.get("fill") in (None, (1.0, 1.0, 1.0)):
+            continue
+        for item in path["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) <= THIN:
+                    add_h((p1.y + p2.y) / 2, p1.x, p2.x)
+                elif abs(p1.x - p2.x) <= THIN:
+                    add_v((p1.x + p2.x) / 2, p1.y, p2.y)
+            elif item[0] in ("re", "qu"):
+                r = item[1] if item[0] == "re" else item[1].rect
+                if r.height <= THIN:
+                    add_h((r.y0 + r.y1) / 2, r.x0, r.x1)
+                elif r.width <= THIN:
+                    add_v((r.x0 + r.x1) / 2, r.y0, r.y1)
+                else:
+                    add_h(r.y0, r.x0, r.x1)
+                    add_h(r.y1, r.x0, r.x1)
+                    add_v(r.x0, r.y0, r.y1)
+                    add_v(r.x1, r.y0, r.y1)
+    return horizontal, vertical
+
+
+def _looks_ruled(page, words: list) -> bool:
+    """
+    Candidata ao flavor lattice: tem grade (>= 2 linhas horizontais e 2 verticais longas),
+    ou >= 2 réguas horizontais de mesma extensão próximas entre si (tabelas só com linhas
+    horizontais), ou uma imagem grande (o lattice também detecta linhas rasterizadas).
+    """
+    width, height = page.rect.width, page.rect.height
+    horizontal, vertical = _page_rules(page, _word_boxes(words))
+
+    h_runs = [(run, y) for y, segs in horizontal.items() for run in _merge_runs(segs)]
+    long_h = {y for (x0, x1), y in h_runs if x1 - x0 >= width / LINE_SCALE}
+    long_v = {x for x, segs in vertical.items()
+              if any(y1 - y0 >= height / LINE_SCALE for y0, y1 in _merge_runs(segs))}
+    if len(long_h) >= 2 and len(long_v) >= 2:
+        return True
+
+    stacks = {}
+    for (x0, x1), y in h_runs:
+        if x1 - x0 >= width / LINE_SCALE:
+            stacks.setdefault((round(x0 / 3), round(x1 / 3)), []).append(y)
+    for ys in stacks.values():
+        ys.sort()
+        if any(y1 - y0 <= height * MAX_RULE_GAP for y0, y1 in zip(ys, ys[1:])):
+            return True
+
+    page_area = width * height
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"]) & page.rect
+        if bbox.width * bbox.height >= MIN_IMAGE_AREA * page_area:
+            return True
+    return False
+
+
+def _tabular_rows(words: list) -> int:
+    """
+    Conta as linhas de texto dispostas em colunas: 3+ trechos separados por MIN_COLUMN_GAP,
+    ou 2 trechos em que o primeiro não é só um rótulo curto (incisos com recuo).
+    """
+    rows = {}
+    for x0, y0, x1, y1, text, *_ in words:
+        rows.setdefault(round(y1 / 3), []).append((x0, x1, text))
+    count = 0
+    for row in rows.values():
+        row.sort()
+        cells = [[row[0][2]]]
+        for (_, prev_x1, _), (x0, _, text) in zip(row, row[1:]):
+            if x0 - prev_x1 > MIN_COLUMN_GAP:
+                cells.append([text])
+            else:
+                cells[-1].append(text)
+        if len(cells) >= 3 or (len(cells) == 2 and len(" ".join(cells[0])) > MIN_LABEL_CHARS):
+            count += 1
+    return count
+
+
+def prescreen_pages(pdf_path: str) -> dict:
+    """
+    Escolhe, com os desenhos e o texto do PyMuPDF (muito mais barato que o Camelot),
+    as páginas que valem a pena por flavor:
+      - lattice: páginas com réguas/grade desenhadas ou imagem grande (_looks_ruled);
+      - stream: páginas com >= MIN_TABULAR_ROWS linhas de texto em colunas (_tabular_rows).
+
+    Returns:
+        dict: {"n_pages": int, "lattice": [páginas], "stream": [páginas]} (numeradas a partir de 1).
+    """
+    candidates = {"n_pages": 0, "lattice": [], "stream": []}
+    with fitz.open(pdf_path) as doc:
+        candidates["n_pages"] = doc.page_count
+        for page in doc:
+            words = page.get_text("words")
+            if _looks_ruled(page, words):
+                candidates["lattice"].append(page.number + 1)
+            if _tabular_rows(words) >= MIN_TABULAR_ROWS:
+                candidates["stream"].append(page.number + 1)
+    return candidates
+
+
+def _is_useful(rows: list) -> bool:
+    """Descarta tabelas de uma linha só ou sem nenhuma célula preenchida."""
+    return len(rows) > 1 and any(cell.strip() for row in rows for cell in row)
+
+
+def _parsing_score(parsing_report: dict) -> float:
+    """Qualidade da detecção: accuracy alta e whitespace baixo (o 'confidence' do Camelot 2, em 0-1)."""
+    return parsing_report["accuracy"] / 100 * (1 - parsing_report["whitespace"] / 100)
+
+
+def table_fingerprint(table: dict, flavor: str) -> dict:
+    """
+    Impressão digital de uma tabela do Camelot (dict de camelot_pool.read_tables): página,
+    bbox, hash das células normalizadas (espaços colapsados, linhas vazias removidas) e
+    score do parsing_report.
+    """
+    rows = table["df"].values.tolist()
+    cells = [[" ".join(str(cell).split()) for cell in row] for row in rows]
+    cells = [row for row in cells if any(row)]
+    return {
+        "flavor": flavor,
+        "page": table["page"],
+        "bbox": table["bbox"],
+        "cells_hash": hashlib.blake2b(json.dumps(cells, ensure_ascii=False).encode("utf-8"), digest_size=16).hexdigest(),
+        "score": _parsing_score(table["parsing_report"]),
+        "rows": rows,
+    }
+
+
+def _bbox_iou(a: tuple, b: tuple) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def merge_table_detections(fingerprints: list, stats: dict = None) -> list:
+    """
+    Resolve as detecções repetidas entre flavors (lattice primeiro, depois stream), em ordem:
+      - conteúdo idêntico (mesmo cells_hash) a uma tabela já aceita na mesma página: descartada;
+      - bbox sobreposta (IoU >= MIN_BBOX_IOU) a uma tabela aceita na mesma página: fica a
+        de maior score do parsing_report, na posição da primeira;
+      - senão, a tabela é aceita.
+    Tabelas iguais em páginas diferentes (ex: uma grade repetida a cada página) são todas
+    mantidas. Indexa as aceitas por (página, hash) e por página, então cada tabela só é
+    comparada com as poucas da sua página: tempo quase linear, em vez de comparar célula a
+    célula com todas as anteriores.
+
+    Se stats (dict) for passado, recebe "exact", "overlap" e "replaced" (vezes em que a
+    detecção posterior venceu a sobreposição).
+    """
+    counts = {"exact": 0, "overlap": 0, "replaced": 0}
+    accepted, by_hash, by_page = [], set(), {}
+    for fp in fingerprints:
+        hash_key = (fp["page"], fp["cells_hash"])
+        if hash_key in by_hash:
+            counts["exact"] += 1
+            continue
+        by_hash.add(hash_key)
+        slots = by_page.setdefault(fp["page"], [])
+        best_slot, best_iou = None, MIN_BBOX_IOU
+        for slot in slots:
+            iou = _bbox_iou(accepted[slot]["bbox"], fp["bbox"])
+            if iou >= best_iou:
+                best_slot, best_iou = slot, iou
+        if best_slot is None:
+            slots.append(len(accepted))
+            accepted.append(fp)
+            continue
+        counts["overlap"] += 1
+        if fp["score"] > accepted[best_slot]["score"]:
+            counts["replaced"] += 1
+            accepted[best_slot] = fp
+    if stats is not None:
+        stats.update(counts)
+    return accepted
+
+
+def _report_prescreen(run_stats: dict) -> None:
+    """Imprime as páginas puladas por flavor e o tempo economizado (estimado)."""
+    n_pages = run_stats["n_pages"]
+    parts, skipped, saved, cache_hits = [], 0, 0.0, 0
+    for flavor in FLAVORS:
+        flavor_stats = run_stats["flavors"][flavor]
+        parts.append(f"{flavor} em {flavor_stats['pages']}/{n_pages}")
+        skipped += flavor_stats["skipped"]
+        saved += flavor_stats["saved_seconds_est"]
+        cache_hits += flavor_stats["cache_hits"]
+    cached = f" | {cache_hits} páginas vieram do cache" if cache_hits else ""
+    print(f"  Pré-triagem de tabelas: {', '.join(parts)} páginas | {skipped} execuções do Camelot "
+          f"puladas, ~{saved:.1f}s economizados (estimado; triagem em {run_stats['prescreen_seconds']:.2f}s){cached}")
+
+
+def extract_tables(pdf_path: str, prescreen: bool = True, workers: int = 1, chunk_size: int = 4,
+                   timeout: float = None, cache_dir: str = None,
+                   stats: dict = None) -> list[list[list[str]]]:
     """
     Extrai tabelas de um arquivo PDF e as retorna em um formato estruturado.
     Tenta extrair usando os dois 'flavors' do Camelot (lattice e stream) para maximizar a precisão.
 
+    Com prescreen=True (padrão, requer PyMuPDF), cada flavor roda só nas páginas candidatas
+    de prescreen_pages, em vez de pages='all': documentos só de texto (regimentos) deixam
+    de passar pelo Camelot. Páginas de texto corrido não vão mais ao stream, que nelas só
+    devolvia parágrafos quebrados em "tabelas". prescreen=False mantém o comportamento antigo.
+
+    A mesma tabela detectada pelos dois flavors aparece uma vez só: merge_table_detections
+    compara página, bbox e hash das células e fica com a detecção de melhor parsing_report.
+
+    Com workers > 1, as páginas de cada flavor são divididas em blocos de chunk_size
+    processados por um pool de processos (camelot_pool.read_tables), com timeout (s) por
+    bloco; a saída é a mesma da execução sequencial.
+
+    Com cache_dir, as tabelas de cada página ficam no cache em disco de camelot_pool
+    (o mesmo diretório pode ser compartilhado com table_pipeline.extractor): reexecuções
+    sobre o mesmo PDF não chamam o Camelot de novo. Sem cache_dir (padrão), nada é gravado.
+
     Args:
         pdf_path (str): O caminho para o arquivo PDF.
+        prescreen (bool): Se deve fazer a pré-triagem de páginas.
+        workers (int): Processos do Camelot (1 = sequencial, no processo atual).
+        chunk_size (int): Páginas por bloco enviado a cada worker.
+        timeout (float, opcional): Tempo máximo de cada bloco no modo paralelo.
+        cache_dir (str, opcional): Diretório do cache de tabelas (None, o padrão, desativa).
+        stats (dict, opcional): Recebe "n_pages", "prescreen_seconds" e, em "flavors", para
+                                cada flavor: páginas processadas ("pages"), puladas ("skipped"),
+                                tempo do Camelot ("seconds"), economia estimada ("saved_seconds_est")
+                                páginas lidas do cache ("cache_hits") e perdidas por erro/timeout
+                                de bloco ("failed_pages");
+                                em "dedup", os contadores de merge_table_detections.
 
     Returns:
         list[list[list[str]]]: Uma lista de tabelas, onde cada tabela é uma lista de linhas,
                                 e cada linha é uma lista de strings (células).
     """
-    all_tables_data = []
+    fingerprints = []
+    run_stats = {"n_pages": None, "prescreen_seconds": 0.0, "flavors": {}, "dedup": {}}
+
+    candidates = None
+    if prescreen and fitz is not None:
+        t0 = time.perf_counter()
+        try:
+            candidates = prescreen_pages(pdf_path)
+            run_stats["n_pages"] = candidates["n_pages"]
+        except Exception as e:
+            print(f"Aviso: Pré-triagem de tabelas falhou, processando todas as páginas: {e}")
+        run_stats["prescreen_seconds"] = time.perf_counter() - t0
 
-    try:
-        tables_lattice = camelot.read_pdf(pdf_path, pages='all', flavor='lattice', suppress_stdout=True)
-        for table in tables_lattice:
-            df = table.df
-            all_tables_data.append(df.values.tolist())
-    except Exception as e:
-        print(f"Aviso: Erro ao extrair tabelas com flavor='lattice': {e}")
+    for flavor in FLAVORS:
+        pages = candidates[flavor] if candidates is not None else None
+        flavor_stats = {"pages": len(pages) if pages is not None else None,
+                        "skipped": run_stats["n_pages"] - len(pages) if pages is not None else 0,
+                        "seconds": 0.0, "saved_seconds_est": 0.0,
+                        "cache_hits": 0, "failed_pages": []}
+        run_stats["flavors"][flavor] = flavor_stats
+        if pages == []:
+            flavor_stats["saved_seconds_est"] = REFERENCE_SECONDS_PER_PAGE[flavor] * flavor_stats["skipped"]
+            continue
 
-    try:
-        tables_stream = camelot.read_pdf(pdf_path, pages='all', flavor='stream', suppress_stdout=True)
-        for table in tables_stream:
-            df = table.df
+        t0 = time.perf_counter()
+        try:
+            pool_stats = {}
+            tables = read_tables(pdf_path, pages if pages is not None else 'all', flavor,
+                                 workers=workers, chunk_size=chunk_size, timeout=timeout,
+                                 cache_dir=cache_dir, stats=pool_stats, suppress_stdout=True)
+            flavor_stats["cache_hits"] = pool_stats["cache_hits"]
+            flavor_stats["failed_pages"] = pool_stats["failed_pages"] + pool_stats["timed_out_pages"]
+            for table in tables:
+                fp = table_fingerprint(table, flavor)
+                if _is_useful(fp["rows"]):
+                    fingerprints.append(fp)
+        except Exception as e:
+            print(f"Aviso: Erro ao extrair tabelas com flavor='{flavor}': {e}")
+        flavor_stats["seconds"] = time.perf_counter() - t0
+        processed = (len(pages) if pages else 0) - flavor_stats["cache_hits"]
+        if processed > 0:
+            # Custo médio por página deste documento x páginas que não foram processadas
+            flavor_stats["saved_seconds_est"] = flavor_stats["seconds"] / processed * flavor_stats["skipped"]
+        else:
+            flavor_stats["saved_seconds_est"] = REFERENCE_SECONDS_PER_PAGE[flavor] * flavor_stats["skipped"]
 
-            if df.values.tolist() not in all_tables_data:
-                all_tables_data.append(df.values.tolist())
-    except Exception as e:
-        print(f"Aviso: Erro ao extrair tabelas com flavor='stream': {e}")
+    tables = merge_table_detections(fingerprints, run_stats["dedup"])
 
-    cleaned_tables = []
-    for table in all_tables_data:
-        if len(table) > 1 and any(cell.strip() for row in table for cell in row):
-            cleaned_tables.append(table)
+    if candidates is not None:
+        _report_prescreen(run_stats)
+    if stats is not None:
+        stats.update(run_stats)
 
-    return cleaned_tables
\ No newline at end of file
+    return [fp["rows"] for fp in tables]
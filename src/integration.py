@@ -2,7 +2,8 @@
 # (Ele deve ficar no mesmo nível que o 'main_pipeline.py')
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from citation_index import CitationIndex
 
 def _format_table_for_final_json(table_data: Dict[str, Any], table_type: str) -> Dict[str, Any]:
     """
@@ -77,7 +78,8 @@ def _format_table_for_final_json(table_data: Dict[str, Any], table_type: str) ->
 
 
 def integrate_table_data(main_json_data: Dict[str, Any], 
-                         table_pipeline_results: Dict[str, List[Any]]) -> Dict[str, Any]:
+                         table_pipeline_results: Dict[str, List[Any]],
+                         citation_index: Optional[CitationIndex] = None) -> Dict[str, Any]:
     """
     Função principal de integração.
     
@@ -85,6 +87,10 @@ def integrate_table_data(main_json_data: Dict[str, Any],
     elementos de parágrafo "fantasma" pelas tabelas reais.
     
     Esta é a sua lógica de "mock manual".
+
+    Se o índice de citações do documento (citation_index) for passado, as posições
+    dos artigos são atualizadas para a nova 'estrutura' (um parágrafo pode virar
+    várias tabelas, deslocando os elementos seguintes).
     """
     
     print("--- [Integração] Iniciando integração de tabelas no JSON principal. ---")
@@ -98,12 +104,15 @@ def integrate_table_data(main_json_data: Dict[str, Any],
 
     # Esta será a nova lista de "estrutura"
     final_estrutura = []
+    # Posição antiga -> nova dos elementos mantidos (para o índice de citações)
+    position_map = {}
     
     # Itera sobre todos os elementos do JSON principal (parágrafos, capítulos...)
-    for elemento in main_json_data["estrutura"]:
+    for posicao, elemento in enumerate(main_json_data["estrutura"]):
         
         # Só nos importamos em substituir parágrafos
         if elemento.get("tipo") != "paragrafo":
+            position_map[posicao] = len(final_estrutura)
             final_estrutura.append(elemento)
             continue
             
@@ -162,6 +171,7 @@ def integrate_table_data(main_json_data: Dict[str, Any],
 
         # Se nenhuma regra bateu ou se deu erro, mantém o elemento original
         if not elemento_substituido:
+            position_map[posicao] = len(final_estrutura)
             final_estrutura.append(elemento)
 
     # --- Fim do Loop ---
@@ -177,4 +187,6 @@ def integrate_table_data(main_json_data: Dict[str, Any],
     
     # Substitui a estrutura antiga pela nova, integrada
     main_json_data["estrutura"] = final_estrutura
+    if citation_index is not None:
+        citation_index.remap_positions(position_map)
     return main_json_data
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_mb() -> float:
+    """Pico de RSS do processo desde o início (MB), ou 0.0 se a plataforma não informar."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em KB no Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def current_rss_mb() -> float:
+    """RSS atual do processo (MB). Sem /proc (ex: macOS/Windows), usa o pico como aproximação."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_mb()
+
+class RSSTracker:
+    """
+    Acompanha o pico de RSS durante um trecho de processamento (ex: um documento).
+    O pico do processo (ru_maxrss) não pode ser zerado entre documentos, então o pico
+    do trecho é o maior valor amostrado com sample() (ex: após cada página).
+    """
+
+    def __init__(self):
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        self.samples = 0
+
+    def sample(self) -> float:
+        rss = current_rss_mb()
+        self.samples += 1
+        if rss > self.peak_mb:
+            self.peak_mb = rss
+        return rss
+
+class PeakRSSSampler:
+    """
+    Context manager que amostra o RSS numa thread em segundo plano e guarda o pico do
+    trecho, sem exigir chamadas a sample() dentro do código medido (ex: benchmarks).
+
+        with PeakRSSSampler() as mem:
+            extract_raw(pdf_path)
+        print(mem.peak_mb)
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+        return False
@@ -1,11 +1,330 @@
+import os
 import re
+import json
 import string
+import hashlib
+import tempfile
+from pathlib import Path
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from unidecode import unidecode
 
+# Incrementar quando a lógica de normalização mudar, invalidando os memos gravados em disco
+NORMALIZE_VERSION = 1
+
+_PUNCTUATION_TRANSLATOR = str.maketrans('', '', string.punctuation)
+
+def _fold_char(ch: str) -> str:
+    """Etapas 3 a 5 aplicadas a um único caractere: minúsculas, sem acento, sem pontuação."""
+    return unidecode(ch.lower()).translate(_PUNCTUATION_TRANSLATOR)
+
+# Tabela fundida das etapas 3-5 para U+0000..U+206F: Latin-1, Latin Extended-A/B (português)
+# e Pontuação Geral (– — “ ” …), que cobrem praticamente todo o texto dos PDFs. Uma lista
+# indexada pelo code point é mais rápida no str.translate do que um dict.
+_FUSED_TABLE_LIMIT = 0x2070
+_FUSED_TABLE = [_fold_char(chr(cp)) for cp in range(_FUSED_TABLE_LIMIT)]
+_OUTSIDE_FUSED_TABLE = re.compile('[^\x00-\u206f]')
+
+_fold_char_cached = lru_cache(maxsize=4096)(_fold_char)
+
+def _fold_text(text: str) -> str:
+    """
+    Etapas 3 a 5 (minúsculas, remoção de acentos e de pontuação) numa única passada.
+    lower(), unidecode e translate atuam caractere a caractere, então o resultado é o mesmo
+    das três passadas separadas; caracteres fora da tabela fundida usam unidecode um a um.
+    """
+    if text.isascii():
+        return text.lower().translate(_PUNCTUATION_TRANSLATOR)
+    folded = text.translate(_FUSED_TABLE)
+    if _OUTSIDE_FUSED_TABLE.search(folded):
+        folded = _OUTSIDE_FUSED_TABLE.sub(lambda m: _fold_char_cached(m.group()), folded)
+    return folded
+
+def _trie_pattern(keys: list[str]) -> str:
+    """
+    Monta uma regex em forma de trie para as chaves (já em minúsculas): prefixos comuns são
+    compartilhados, então cada posição do texto é testada caractere a caractere em vez de
+    chave a chave. Os finais de chave são opcionais gulosos, logo o casamento mais longo é
+    tentado primeiro e o regex recua para chaves mais curtas se a fronteira final falhar.
+    """
+    trie = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+class Normalizer:
+    """
+    Normalizador com os dicionários de siglas/padronização compilados uma única vez.
+
+    As chaves são reunidas numa única regex (trie), aplicada em UMA passada sobre o texto
+    (em vez de um re.sub por chave). Em cada posição vale a chave mais longa que casa com
+    fronteiras de palavra, como na substituição chave a chave em ordem decrescente de
+    tamanho; entre variações só de maiúsculas/minúsculas, vale a primeira dessa ordem.
+    O texto inserido por uma substituição não é reprocessado pelas demais chaves, e chaves
+    que se sobrepõem em posições diferentes são resolvidas da esquerda para a direita (com os
+    dicionários de data/input o resultado é idêntico ao da substituição chave a chave).
+
+    Reutilize a mesma instância entre chamadas (ver load_normalizer e normalize_text).
+    """
+
+    def __init__(self, acronyms: dict = None, standardization_map: dict = None):
+        acronyms = acronyms or {}
+        standardization_map = standardization_map or {}
+
+        # Unifica os dois dicionários para uma única passada de substituição.
+        # A padronização vem primeiro para evitar conflitos com siglas.
+        combined_map = {**standardization_map, **acronyms}
+
+        # Ordena as chaves por comprimento, da maior para a menor, para evitar substituições parciais
+        # Ex: substituir "BCC" antes de uma hipotética sigla "BC".
+        self._sorted_keys = sorted(combined_map.keys(), key=len, reverse=True)
+        self._combined_map = combined_map
+
+        # Versão dos dicionários (e da lógica): identifica o resultado nos memos de normalização
+        self.version = hashlib.sha256(
+            json.dumps([NORMALIZE_VERSION, list(combined_map.items())], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+
+        # Substituição por chave em minúsculas (a primeira na ordem vence, como no laço original)
+        self._lookup = {}
+        for key in self._sorted_keys:
+            self._lookup.setdefault(key.lower(), combined_map[key])
+
+        self._pattern = None
+        if self._sorted_keys:
+            # re.escape (dentro de _trie_pattern) trata caracteres especiais das chaves (ex: pontos em U.S.A.).
+            # Usa \b (word boundary) para garantir que estamos substituindo a palavra/sigla inteira
+            # e re.IGNORECASE para capturar variações como 'ppc' ou 'PPC'.
+            self._pattern = re.compile(r'\b' + _trie_pattern(list(self._lookup)) + r'\b', re.IGNORECASE)
+
+    def _replace(self, match: re.Match) -> str:
+        found = match.group(0)
+        replacement = self._lookup.get(found.lower())
+        if replacement is None:
+            # Casos raros em que o IGNORECASE casa mas lower() difere (ex: 'ſ'): busca a chave
+            for key in self._sorted_keys:
+                if re.fullmatch(re.escape(key), found, re.IGNORECASE):
+                    return self._combined_map[key]
+            return found
+        return replacement
+
+    def expand(self, text: str) -> str:
+        """Etapa 2: expansão de siglas e padronização de termos, em uma única passada."""
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+    def normalize(self, raw_text: str) -> str:
+        """Aplica todas as etapas de normalize_text com os dicionários já compilados."""
+        # Etapa 1: Correção de hifenização e quebras de linha
+        # Remove o hífen no final de uma linha e junta a palavra com a continuação na próxima linha.
+        # Ex: "gradua-\nção" -> "graduação"
+        normalized_text = re.sub(r'-\n\s*', '', raw_text)
+        # Substitui quebras de linha por espaço para unificar o texto em um fluxo contínuo.
+        normalized_text = normalized_text.replace('\n', ' ')
+
+        # Etapa 2: Expansão de siglas e padronização de termos
+        normalized_text = self.expand(normalized_text)
+
+        # Etapas 3 a 5: Conversão para minúsculas, remoção de acentos e de pontuação
+        # Padroniza o texto para caixa baixa, translitera caracteres acentuados (ex: 'ção' -> 'cao')
+        # e remove todos os caracteres de string.punctuation, com uma tabela de tradução fundida.
+        # A remoção de pontuação é "agressiva". Em alguns cenários, pode ser útil manter hífens ou outros sinais.
+        normalized_text = _fold_text(normalized_text)
+
+        # Etapa 6: Normalização de espaços em branco
+        # Substitui múltiplos espaços, tabulações, etc., por um único espaço e remove espaços no início/fim
+        # (split() sem argumentos usa a mesma definição de espaço em branco que \s).
+        normalized_text = ' '.join(normalized_text.split())
+
+        return normalized_text
+
+    __call__ = normalize
+
+class NormalizationMemo:
+    """
+    Memo do texto normalizado, chaveado pelo hash do texto bruto e pela versão dos
+    dicionários (Normalizer.version): cláusulas e linhas repetidas entre documentos
+    (Estatuto, Regimentos) são normalizadas uma única vez.
+
+    Uso: normalize(normalizer, texto) consulta o memo e normaliza só o que faltar; get/put
+    servem a quem normaliza por outro caminho (ex: os workers de normalize_many).
+
+    Em memória é um LRU limitado a max_entries. Com cache_dir, cada versão dos dicionários
+    também tem um arquivo JSON (normalized_<versão>.json) carregado na primeira consulta e
+    regravado de forma atômica por save() só quando há entradas novas, com no máximo
+    max_disk_entries entradas. Nos dois níveis, o descarte segue a ordem de acesso: as
+    entradas usadas há mais tempo saem primeiro. Erros de I/O do memo em disco nunca interrompem a normalização.
+
+    hits/misses contam as consultas; disk_hits, quantos dos hits vieram do arquivo em disco.
+    """
+
+    def __init__(self, max_entries: int = 50_000, cache_dir: str = None, max_disk_entries: int = 500_000):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._disk = {}       # versão -> OrderedDict {hash: texto normalizado}, em ordem de acesso
+        self._dirty = set()   # versões com entradas novas ainda não gravadas
+
+    @staticmethod
+    def _text_hash(raw_text: str) -> str:
+        return hashlib.blake2b(raw_text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+    def _disk_path(self, version: str) -> Path:
+        return self.cache_dir / f"normalized_{version}.json"
+
+    def _disk_entries(self, version: str) -> OrderedDict:
+        entries = self._disk.get(version)
+        if entries is None:
+            entries = OrderedDict()
+            try:
+                with open(self._disk_path(version), "r", encoding="utf-8") as f:
+                    loaded = json.load(f, object_pairs_hook=OrderedDict)
+                if isinstance(loaded, OrderedDict):
+                    entries = loaded
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError):
+                # Arquivo corrompido: recomeça do zero (será sobrescrito no próximo save)
+                pass
+            self._disk[version] = entries
+        return entries
+
+    def normalize(self, normalizer: Normalizer, raw_text: str) -> str:
+        """Retorna normalizer.normalize(raw_text), reaproveitando resultados já calculados."""
+        normalized = self.get(normalizer, raw_text)
+        if normalized is None:
+            normalized = normalizer.normalize(raw_text)
+            self.put(normalizer, raw_text, normalized)
+        return normalized
+
+    def get(self, normalizer: Normalizer, raw_text: str):
+        """Texto normalizado de raw_text com esse normalizer, ou None se não estiver no memo."""
+        key = (normalizer.version, self._text_hash(raw_text))
+        normalized = self._entries.get(key)
+        if normalized is not None:
+            self._entries.move_to_end(key)
+            self._touch_disk(key)
+            self.hits += 1
+            return normalized
+        if self.cache_dir is not None:
+            normalized = self._disk_entries(key[0]).get(key[1])
+            if isinstance(normalized, str):
+                self._remember(key, normalized)
+                self._touch_disk(key)
+                self.hits += 1
+                self.disk_hits += 1
+                return normalized
+        self.misses += 1
+        return None
+
+    def put(self, normalizer: Normalizer, raw_text: str, normalized: str) -> None:
+        """Guarda o resultado de normalizer.normalize(raw_text) (em memória e, com cache_dir, em disco)."""
+        key = (normalizer.version, self._text_hash(raw_text))
+        self._remember(key, normalized)
+        if self.cache_dir is not None:
+            entries = self._disk_entries(key[0])
+            entries[key[1]] = normalized
+            entries.move_to_end(key[1])
+            self._dirty.add(key[0])
+
+    def _remember(self, key: tuple, normalized: str) -> None:
+        self._entries[key] = normalized
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _touch_disk(self, key: tuple) -> None:
+        """
+        Marca a entrada em disco como a usada mais recentemente (ordem de descarte do save).
+        Só reordena em memória: um acerto não torna o arquivo sujo, então uma execução sem
+        entradas novas não regrava nada; a nova ordem vai para o disco no próximo save com put.
+        """
+        entries = self._disk.get(key[0]) if self.cache_dir is not None else None
+        if entries and key[1] in entries:
+            entries.move_to_end(key[1])
+
+    def save(self) -> None:
+        """Grava no cache_dir as entradas novas (sem efeito se não houver cache em disco)."""
+        if self.cache_dir is None:
+            return
+        for version in list(self._dirty):
+            entries = self._disk[version]
+            if len(entries) > self.max_disk_entries:
+                # A ordem das entradas é a de acesso: descarta as usadas há mais tempo
+                for _ in range(len(entries) - self.max_disk_entries):
+                    entries.popitem(last=False)
+            tmp_path = None
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self._disk_path(version))
+                self._dirty.discard(version)
+            except OSError as e:
+                print(f"⚠️ Memo de normalização: não foi possível gravar em '{self.cache_dir}': {e}")
+                if tmp_path:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+@lru_cache(maxsize=8)
+def _normalizer_for_items(acronym_items: tuple, standardization_items: tuple) -> Normalizer:
+    return Normalizer(dict(acronym_items), dict(standardization_items))
+
+@lru_cache(maxsize=8)
+def _normalizer_for_file(path: str, mtime_ns: int) -> Normalizer:
+    with open(path, 'r', encoding='utf-8') as f:
+        dictionaries = json.load(f)
+    return Normalizer(dictionaries.get("acronyms", {}), dictionaries.get("standardization_map", {}))
+
+def load_normalizer(dictionaries_path: str) -> Normalizer:
+    """
+    Carrega (ou reaproveita) o Normalizer compilado a partir de um dicionarios.json.
+    O cache é indexado pelo caminho e pela data de modificação do arquivo, então editar
+    os dicionários gera uma nova compilação na próxima chamada.
+    Lança FileNotFoundError se o arquivo não existir.
+    """
+    path = os.path.abspath(dictionaries_path)
+    return _normalizer_for_file(path, os.stat(path).st_mtime_ns)
+
 def normalize_text(
     raw_text: str,
     acronyms: dict = None,
-    standardization_map: dict = None
+    standardization_map: dict = None,
+    memo: NormalizationMemo = None
 ) -> str:
     """
     Normaliza o texto, realizando uma série de etapas de limpeza e padronização.
@@ -18,60 +337,107 @@ def normalize_text(
     5.  Remoção de pontuação.
     6.  Normalização de espaços em branco.
 
+    Os dicionários são compilados num Normalizer, reaproveitado enquanto o conteúdo
+    deles não mudar (chamadas bloco a bloco não recompilam a regex). Com memo, textos
+    repetidos são servidos por ele.
+
     Args:
         raw_text (str): O texto bruto a ser normalizado.
         acronyms (dict): Dicionário com siglas a serem expandidas.
                          Ex: {"PPC": "Projeto Pedagógico de Curso"}.
         standardization_map (dict): Dicionário para padronizar termos.
                                      Ex: {"discente": "aluno", "docente": "professor"}.
+        memo (NormalizationMemo, opcional): Memo de resultados (por padrão, nenhum).
 
     Returns:
         str: O texto normalizado e limpo.
     """
-    if acronyms is None:
-        acronyms = {}
-    if standardization_map is None:
-        standardization_map = {}
-
-    # Etapa 1: Correção de hifenização e quebras de linha
-    # Remove o hífen no final de uma linha e junta a palavra com a continuação na próxima linha.
-    # Ex: "gradua-\nção" -> "graduação"
-    normalized_text = re.sub(r'-\n\s*', '', raw_text)
-    # Substitui quebras de linha por espaço para unificar o texto em um fluxo contínuo.
-    normalized_text = normalized_text.replace('\n', ' ')
-
-    # Etapa 2: Expansão de siglas e padronização de termos
-    # Unifica os dois dicionários para uma única passada de substituição.
-    # A padronização vem primeiro para evitar conflitos com siglas.
-    combined_map = {**standardization_map, **acronyms}
-
-    # Ordena as chaves por comprimento, da maior para a menor, para evitar substituições parciais
-    # Ex: substituir "BCC" antes de uma hipotética sigla "BC".
-    sorted_keys = sorted(combined_map.keys(), key=len, reverse=True)
-
-    for key in sorted_keys:
-        # Usa \b (word boundary) para garantir que estamos substituindo a palavra/sigla inteira.
-        # re.escape trata caracteres especiais que possam existir na chave (ex: pontos em U.S.A.).
-        pattern = r'\b' + re.escape(key) + r'\b'
-        # Usa re.IGNORECASE para capturar variações como 'ppc' ou 'PPC'.
-        normalized_text = re.sub(pattern, combined_map[key], normalized_text, flags=re.IGNORECASE)
-
-    # Etapa 3: Conversão para minúsculas
-    # Padroniza todo o texto para caixa baixa, facilitando comparações e processamento.
-    normalized_text = normalized_text.lower()
-
-    # Etapa 4: Remoção de acentos
-    # Translitera caracteres acentuados para suas versões não acentuadas (ex: 'ção' -> 'cao').
-    normalized_text = unidecode(normalized_text)
-
-    # Etapa 5: Remoção de pontuação
-    # Cria um tradutor que remove todos os caracteres de pontuação definidos em string.punctuation.
-    # Esta é uma abordagem "agressiva". Em alguns cenários, pode ser útil manter hífens ou outros sinais.
-    translator = str.maketrans('', '', string.punctuation)
-    normalized_text = normalized_text.translate(translator)
-
-    # Etapa 6: Normalização de espaços em branco
-    # Substitui múltiplos espaços, tabulações, etc., por um único espaço e remove espaços no início/fim.
-    normalized_text = re.sub(r'\s+', ' ', normalized_text).strip()
-
-    return normalized_text
+    normalizer = _normalizer_for_items(
+        tuple((acronyms or {}).items()),
+        tuple((standardization_map or {}).items())
+    )
+    if memo is None:
+        return normalizer.normalize(raw_text)
+    return memo.normalize(normalizer, raw_text)
+
+# Normalizer compartilhado por cada worker de normalize_many (recebido uma vez no initializer)
+_WORKER_NORMALIZER = None
+
+def _init_normalize_worker(normalizer: Normalizer):
+    global _WORKER_NORMALIZER
+    _WORKER_NORMALIZER = normalizer
+
+def _normalize_chunk(texts: list[str]) -> list[str]:
+    return [_WORKER_NORMALIZER.normalize(text) for text in texts]
+
+def normalize_many(
+    blocks: Iterable[dict],
+    normalizer: Normalizer = None,
+    workers: int = 1,
+    chunk_size: int = 256,
+    text_key: str = "texto_bruto",
+    output_key: str = "texto_normalizado",
+    memo: NormalizationMemo = None
+) -> Iterator[dict]:
+    """
+    Normaliza o campo text_key de cada bloco em output_key (por padrão, texto_bruto ->
+    texto_normalizado) e gera os blocos na mesma ordem de entrada. Os dicts recebidos
+    são atualizados no lugar; textos ausentes (None) viram "".
+
+    blocks pode ser uma lista ou um iterador (ex: linhas de um JSONL lidas sob demanda),
+    consumido uma única vez. Com workers > 1, os blocos são agrupados em lotes de
+    chunk_size e normalizados por um pool de processos que recebe o Normalizer compilado
+    uma única vez por worker; só os textos trafegam entre processos. No máximo 2 lotes
+    por worker ficam em andamento, então a memória não cresce com o tamanho do corpus.
+
+    Com memo, textos já normalizados são servidos por ele no processo principal e só os
+    demais vão para os workers; os novos resultados entram no memo.
+    """
+    normalizer = normalizer or Normalizer()
+
+    if workers <= 1:
+        for block in blocks:
+            raw_text = block.get(text_key) or ""
+            if memo is not None:
+                block[output_key] = memo.normalize(normalizer, raw_text)
+            else:
+                block[output_key] = normalizer.normalize(raw_text)
+            yield block
+        return
+
+    iterator = iter(blocks)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    pending = deque()
+
+    def _finish_oldest():
+        chunk, missing, future = pending.popleft()
+        for (i, raw_text), normalized in zip(missing, future.result()):
+            chunk[i][output_key] = normalized
+            if memo is not None:
+                memo.put(normalizer, raw_text, normalized)
+        return chunk
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_normalize_worker, initargs=(normalizer,)
+    )
+    try:
+        for chunk in chunks:
+            missing, texts = [], []
+            for i, block in enumerate(chunk):
+                raw_text = block.get(text_key) or ""
+                if memo is not None:
+                    normalized = memo.get(normalizer, raw_text)
+                    if normalized is not None:
+                        block[output_key] = normalized
+                        continue
+                missing.append((i, raw_text))
+                texts.append(raw_text)
+            pending.append((chunk, missing, executor.submit(_normalize_chunk, texts)))
+            # Os lotes são entregues na ordem de envio -> blocos na ordem de entrada
+            if len(pending) >= 2 * workers:
+                yield from _finish_oldest()
+        while pending:
+            yield from _finish_oldest()
+    finally:
+        # Se o consumidor parar no meio, descarta os lotes ainda não iniciados
+        executor.shutdown(wait=True, cancel_futures=True)
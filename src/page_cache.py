@@ -0,0 +1,113 @@
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+# Incrementar quando a lógica de extração mudar, invalidando as entradas antigas
+CACHE_VERSION = 1
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hash SHA-256 do conteúdo do arquivo (identifica o PDF independentemente do nome)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class PageCache:
+    """
+    Cache em disco de resultados de extração por página.
+
+    Cada entrada é um JSON com a própria chave (hash do arquivo, página, backend, parâmetros)
+    e o valor; a chave é conferida na leitura, então entradas corrompidas, de outra versão ou
+    com colisão de nome são tratadas como ausentes e removidas. Gravações são atômicas
+    (arquivo temporário + os.replace), e nenhum erro de I/O do cache interrompe a extração.
+    O tamanho total é limitado a max_bytes, descartando as entradas usadas há mais tempo (LRU
+    pela data de modificação, atualizada a cada leitura).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._write_failed = False
+
+    def _entry_path(self, key: dict) -> Path:
+        key_hash = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+        return self.cache_dir / key_hash[:2] / f"{key_hash}.json"
+
+    def get(self, key: dict):
+        """Retorna o valor armazenado para a chave ou None (ausente, corrompido ou obsoleto)."""
+        key = {"cache_version": CACHE_VERSION, **key}
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("key") != key or "value" not in entry:
+                raise ValueError("entrada obsoleta")
+            os.utime(path)  # marca como usada recentemente (LRU)
+            self.hits += 1
+            return entry["value"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError):
+            # JSON inválido, entrada de outra versão etc.: descarta e recalcula
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self.misses += 1
+        return None
+
+    def put(self, key: dict, value) -> None:
+        """Grava o valor (serializável em JSON) para a chave; falhas são ignoradas."""
+        if self._write_failed:
+            return
+        key = {"cache_version": CACHE_VERSION, **key}
+        path = self._entry_path(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            # Avisa uma única vez e desiste de gravar (ex: diretório sem permissão)
+            print(f"⚠️ Cache de páginas: não foi possível gravar em '{self.cache_dir}', seguindo sem cache: {e}")
+            self._write_failed = True
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def evict(self) -> int:
+        """Remove as entradas menos recentes até o cache caber em max_bytes. Retorna quantas removeu."""
+        entries = []
+        total = 0
+        try:
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        except OSError:
+            return 0
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+        return removed
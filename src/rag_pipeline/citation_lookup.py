@@ -0,0 +1,105 @@
+import os
+import json
+import glob
+from typing import List, Dict, Any
+from unidecode import unidecode
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+from citation_index import CitationIndex, other_article_labels, parse_citation
+
+# --- FUNÇÃO 1: Carregar os índices de citações gerados pelo main.py ---
+def load_citation_sources(output_dir: str = "data/output") -> List[Dict[str, Any]]:
+    """
+    Carrega cada '<nome>_citacoes.json' junto com a 'estrutura' do JSON de saída
+    correspondente ('<nome>_output.jsonl'). Índices sem JSON de saída são ignorados.
+    """
+    sources = []
+    for index_path in sorted(glob.glob(os.path.join(output_dir, "*_citacoes.json"))):
+        base_name = os.path.basename(index_path)[:-len("_citacoes.json")]
+        output_path = os.path.join(output_dir, f"{base_name}_output.jsonl")
+        try:
+            citation_index = CitationIndex.load(index_path)
+            with open(output_path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Aviso [RAG Citações]: índice '{index_path}' ignorado: {e}")
+            continue
+        sources.append({
+            "source_file": os.path.basename(output_path),
+            "nome_doc": document.get("nome_doc", base_name),
+            "chave_nome": unidecode(f"{base_name} {document.get('nome_doc', '')}").lower(),
+            "index": citation_index,
+            "estrutura": document.get("estrutura", []),
+        })
+    print(f"  [RAG Citações] {len(sources)} índices de citações carregados.")
+    return sources
+
+def _format_cited(item: Dict[str, Any], artigo_titulo: str) -> str:
+    if "paragrafos" in item:
+        partes = [artigo_titulo]
+        for paragrafo in item["paragrafos"]:
+            partes.append(" ".join(p for p in (paragrafo.get("numero"), paragrafo.get("texto")) if p))
+        return "\n".join(partes)
+    return f"{artigo_titulo} {item.get('numero') or ''} {item.get('texto', '')}".strip()
+
+# --- FUNÇÃO 2: Resolver a citação da pergunta ---
+def find_cited_documents(question: str, sources: List[Dict[str, Any]]) -> List[Document]:
+    """
+    Se a pergunta citar um artigo (ex: "o que diz o Art. 42, § 1º, inciso II do Regimento"), retorna
+    o trecho exato de cada documento que o contém, por consulta direta aos índices.
+    Se o nome de algum documento aparecer na pergunta, restringe a busca a ele(s).
+    Trechos que contêm o rótulo de outro artigo (artigo mal segmentado) são descartados.
+    Retorna [] se não houver citação ou se ela não for encontrada.
+    """
+    artigo, paragrafo, inciso = parse_citation(question)
+    if artigo is None:
+        return []
+
+    pergunta = unidecode(question).lower()
+    nomeados = [
+        s for s in sources
+        if any(len(palavra) > 3 and palavra in pergunta
+               for palavra in s["chave_nome"].replace("_", " ").replace("-", " ").split())
+    ]
+
+    documents = []
+    for source in nomeados or sources:
+        item = source["index"].resolve(source["estrutura"], artigo, paragrafo, inciso)
+        if item is None:
+            continue
+        entry = source["index"].lookup(artigo, paragrafo, inciso)
+        artigo_titulo = source["index"].lookup(artigo)["titulo"]
+        texto = _format_cited(item, artigo_titulo)
+        outros = other_article_labels(texto, artigo)
+        if outros:
+            # O trecho engloba outros artigos: a estrutura não separou o artigo citado
+            print(f"Aviso [RAG Citações]: trecho de '{artigo_titulo}' em '{source['source_file']}' "
+                  f"contém outros artigos ({', '.join(outros[:3])}); ignorado.")
+            continue
+        documents.append(Document(
+            page_content=texto,
+            metadata={
+                "source_file": source["source_file"],
+                "pagina": entry.get("pagina"),
+                "texto_bruto_resposta": texto,
+                "citacao": {"artigo": artigo, "paragrafo": paragrafo, "inciso": inciso},
+            }
+        ))
+    return documents
+
+# --- FUNÇÃO 3: Ponto de Entrada ---
+def with_citation_lookup(retriever, sources: List[Dict[str, Any]]):
+    """
+    Envolve o retriever: perguntas com citação exata resolvida pelos índices são
+    respondidas sem consultar o vector store; as demais seguem para o retriever.
+    O resultado pode ser passado direto para create_rag_chain.
+    """
+    def _retrieve(question: str) -> List[Document]:
+        cited = find_cited_documents(question, sources)
+        if cited:
+            print(f"  [RAG Citações] Citação resolvida pelo índice ({len(cited)} trecho(s)).")
+            return cited
+        return retriever.invoke(question)
+
+    return RunnableLambda(_retrieve)
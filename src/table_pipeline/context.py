@@ -0,0 +1,87 @@
+# table_pipeline/context.py
+import fitz  # PyMuPDF
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+from .extractor import CamelotSession
+
+class DocumentContext:
+    """
+    Estado compartilhado de UM documento durante o table_pipeline: o fitz.Document aberto
+    (uma vez só), o texto de cada página (extraído uma vez só) e as tabelas do Camelot
+    (CamelotSession, com o cache de tabelas em cache_dir se for passado). O table_runner
+    cria o contexto e o entrega a todos os processadores.
+
+    Uso:
+        with DocumentContext(pdf_path) as context:
+            context.page_text(20)        # get_text da página, guardado
+            context.extract_tables([20]) # uma chamada ao Camelot para o lote
+            context.tables(20)           # [DataFrames] da página
+    """
+
+    def __init__(self, pdf_path: str, session: CamelotSession = None, cache_dir: str = None):
+        self.pdf_path = pdf_path
+        self.session = session if session is not None else CamelotSession(pdf_path, cache_dir=cache_dir)
+        self.text_extractions = 0
+        self._doc: Optional[fitz.Document] = None
+        self._page_count: Optional[int] = None
+        self._texts: Dict[int, str] = {}
+
+    def __enter__(self) -> "DocumentContext":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def doc(self) -> fitz.Document:
+        """O fitz.Document, aberto na primeira vez que é pedido."""
+        if self._doc is None:
+            self._doc = fitz.open(self.pdf_path)
+            self._page_count = len(self._doc)
+        return self._doc
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            self._page_count = len(self.doc)
+        return self._page_count
+
+    def page(self, page_num: int) -> fitz.Page:
+        """Página (a partir de 1) do documento aberto."""
+        return self.doc.load_page(page_num - 1)
+
+    def page_text(self, page_num: int) -> str:
+        """Texto da página (get_text("text")), extraído só na primeira chamada; o objeto da página
+        é carregado só para a extração e não fica guardado no contexto."""
+        text = self._texts.get(page_num)
+        if text is None:
+            text = self.page(page_num).get_text("text")
+            self._texts[page_num] = text
+            self.text_extractions += 1
+        return text
+
+    def extract_tables(self, page_nums: Iterable[int]) -> Dict[int, List[pd.DataFrame]]:
+        """Tabelas de um lote de páginas numa única chamada ao Camelot (veja CamelotSession.extract)."""
+        return self.session.extract(page_nums)
+
+    def tables(self, page_num: int) -> List[pd.DataFrame]:
+        """Tabelas de uma página (extrai só ela se ainda não estiverem no contexto)."""
+        return self.session.get(page_num)
+
+    def subset(self, page_nums: Iterable[int]) -> "DocumentContext":
+        """
+        Novo contexto só com o texto e as tabelas já extraídos dessas páginas, sem o
+        documento aberto (um fitz.Document não passa para outro processo): é o que vai
+        para cada worker do table_runner.
+        """
+        page_nums = list(page_nums)
+        context = DocumentContext(self.pdf_path, session=self.session.subset(page_nums))
+        context._page_count = self._page_count
+        context._texts = {page_num: self._texts[page_num] for page_num in page_nums if page_num in self._texts}
+        return context
+
+    def close(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
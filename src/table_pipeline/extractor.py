@@ -1,23 +1,99 @@
-import camelot
 import pandas as pd
-from typing import List
+from typing import Dict, Iterable, List
 
-def get_raw_tables_from_page(pdf_path: str, page_num: int) -> List[pd.DataFrame]:
+from camelot_pool import read_tables
+
+# Parâmetros do Camelot usados pelos processadores (horario, ppc, calendar)
+CAMELOT_KWARGS = {"flavor": "lattice", "line_scale": 40}
+
+class CamelotSession:
+    """
+    Sessão de extração de tabelas de UM documento: recebe lotes de páginas e faz uma
+    única chamada ao Camelot por lote (o PDF é aberto e dividido uma vez só, em vez de
+    uma vez por página), guardando as tabelas por página para os processadores.
+
+    Uso (table_runner):
+        session = CamelotSession(pdf_path)
+        session.extract([19, 20, 21])   # uma chamada ao Camelot
+        session.get(20)                 # [DataFrames] da página, sem nova chamada
+    """
+
+    def __init__(self, pdf_path: str, workers: int = 1, chunk_size: int = 4,
+                 timeout: float = None, cache_dir: str = None):
+        self.pdf_path = pdf_path
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.camelot_calls = 0
+        self._tables: Dict[int, List[pd.DataFrame]] = {}
+
+    def _read(self, page_nums: List[int]) -> Dict[int, List[pd.DataFrame]]:
+        kwargs = dict(CAMELOT_KWARGS)
+        flavor = kwargs.pop("flavor")
+        self.camelot_calls += 1
+        tables = read_tables(self.pdf_path, page_nums, flavor, workers=self.workers,
+                             chunk_size=self.chunk_size, timeout=self.timeout,
+                             cache_dir=self.cache_dir, **kwargs)
+        tables_by_page = {page_num: [] for page_num in page_nums}
+        for table in tables:
+            # Filtra tabelas vazias
+            if not table["df"].empty:
+                tables_by_page[table["page"]].append(table["df"])
+        return tables_by_page
+
+    def extract(self, page_nums: Iterable[int]) -> Dict[int, List[pd.DataFrame]]:
+        """
+        Extrai as tabelas das páginas ainda não extraídas numa única chamada e retorna
+        {página: [DataFrames]} para todas as páginas pedidas. Se o lote falhar, tenta
+        página a página, então um erro do Camelot só afeta a própria página.
+        """
+        page_nums = sorted(set(page_nums))
+        missing = [page_num for page_num in page_nums if page_num not in self._tables]
+        if missing:
+            try:
+                self._tables.update(self._read(missing))
+            except Exception as e:
+                print(f"Alerta [Extractor]: Erro no Camelot ao processar págs {missing}: {e}. Tentando página a página.")
+                for page_num in missing:
+                    try:
+                        self._tables.update(self._read([page_num]))
+                    except Exception as e:
+                        print(f"Alerta [Extractor]: Erro no Camelot ao processar pág {page_num}: {e}")
+                        self._tables[page_num] = []
+        return {page_num: self._tables[page_num] for page_num in page_nums}
+
+    def get(self, page_num: int) -> List[pd.DataFrame]:
+        """Tabelas de uma página (extrai só ela se ainda não estiver na sessão)."""
+        return self.extract([page_num])[page_num]
+
+    def subset(self, page_nums: Iterable[int]) -> "CamelotSession":
+        """
+        Nova sessão com a mesma configuração e só as tabelas já extraídas dessas páginas
+        (o que vai para cada worker do table_runner, em vez das tabelas do documento todo).
+        """
+        session = CamelotSession(self.pdf_path, workers=self.workers, chunk_size=self.chunk_size,
+                                 timeout=self.timeout, cache_dir=self.cache_dir)
+        session._tables = {page_num: self._tables[page_num] for page_num in page_nums if page_num in self._tables}
+        return session
+
+def get_raw_tables_from_page(pdf_path: str, page_num: int, cache_dir: str = None) -> List[pd.DataFrame]:
     """
     Extrai todas as tabelas brutas de uma ÚNICA página usando Camelot (lattice).
     (Esta é a função do seu horario_parser.py e ppc_parser.py)
+    Com cache_dir, passa pelo cache de tabelas em disco (o mesmo de extract_tables).
+    Para várias páginas do mesmo documento, prefira CamelotSession (uma chamada por lote).
     """
-    tables_found = []
-    try:
-        tables = camelot.read_pdf(
-            pdf_path,
-            pages=str(page_num),
-            flavor='lattice',
-            line_scale=40 
-        )
-        if tables:
-            # Filtra tabelas vazias
-            tables_found = [tbl.df for tbl in tables if not tbl.df.empty]
-    except Exception as e:
-        print(f"Alerta [Extractor]: Erro no Camelot ao processar pág {page_num}: {e}")
-    return tables_found
\ No newline at end of file
+    return CamelotSession(pdf_path, cache_dir=cache_dir).get(page_num)
+
+def get_raw_tables_from_pages(pdf_path: str, page_nums: List[int], workers: int = 1, chunk_size: int = 4,
+                              timeout: float = None, cache_dir: str = None) -> Dict[int, List[pd.DataFrame]]:
+    """
+    Versão em lote de get_raw_tables_from_page: {página: [DataFrames]} para cada página pedida
+    (lista vazia se não houver tabela ou se o Camelot falhar nela).
+    Com workers > 1, as páginas são divididas em blocos de chunk_size processados por um
+    pool de processos, com timeout (s) por bloco (veja camelot_pool.read_tables).
+    """
+    session = CamelotSession(pdf_path, workers=workers, chunk_size=chunk_size,
+                             timeout=timeout, cache_dir=cache_dir)
+    return session.extract(page_nums)
@@ -1,14 +1,22 @@
 # table_pipeline/identifier.py
+import time
 import fitz # PyMuPDF
 from typing import Literal
 
 PageType = Literal["horario", "ppc", "calendar", "history_log", "unknown"]
 
-def identify_page_type(page: fitz.Page) -> PageType:
-    """Analisa o TEXTO de uma página fitz e retorna seu tipo."""
-    
-    text = page.get_text("text").lower() # Converte tudo para minúsculo
+def classify_text(text: str, stats: dict = None) -> PageType:
+    """
+    Tipo da página a partir do seu texto (as regras de identify_page_type).
+    Se stats (dict) for passado, incrementa stats["type_hits"][tipo].
+    """
+    page_type = _classify_lowered(text.lower()) # Converte tudo para minúsculo
+    if stats is not None:
+        type_hits = stats.setdefault("type_hits", {})
+        type_hits[page_type] = type_hits.get(page_type, 0) + 1
+    return page_type
 
+def _classify_lowered(text: str) -> PageType:
     # --- Regras de Identificação---
 
     # 1. Regra para PPC (do ppc_parser.py)
@@ -36,4 +44,21 @@ def identify_page_type(page: fitz.Page) -> PageType:
         return "history_log"
 
     # Se nenhuma regra bater
-    return "unknown"
\ No newline at end of file
+    return "unknown"
+
+def identify_page_type(page: fitz.Page = None, stats: dict = None, text: str = None,
+                       page_num: int = None) -> PageType:
+    """
+    Analisa o TEXTO de uma página fitz e retorna seu tipo.
+    Com text (ex: DocumentContext.page_text), usa esse texto e a página nem precisa ser
+    passada (page_num identifica a página em stats); sem text, extrai o texto de page.
+    Se stats (dict) for passado, recebe os contadores por tipo ("type_hits") e o tempo
+    de cada página em "page_seconds" ({número da página: segundos}, com a extração do texto quando feita aqui).
+    """
+    t0 = time.perf_counter()
+    page_type = classify_text(page.get_text("text") if text is None else text, stats)
+    if stats is not None:
+        if page_num is None:
+            page_num = page.number + 1
+        stats.setdefault("page_seconds", {})[page_num] = time.perf_counter() - t0
+    return page_type
@@ -3,6 +3,7 @@ from typing import Dict, Any, Optional, List
 
 # Importa a "caixa de ferramentas" da nossa arquitetura
 from ..extractor import get_raw_tables_from_page
+from ..context import DocumentContext
 
 # --- Funções "Privadas" ---
 
@@ -118,15 +119,16 @@ def _process_calendar_df(raw_df: pd.DataFrame) -> Dict[str, Any]:
 
 # --- Função "Pública" ---
 
-def process_calendar_page(pdf_path: str, page_num: int) -> Optional[Dict[str, Any]]:
+def process_calendar_page(pdf_path: str, page_num: int, context: DocumentContext = None) -> Optional[Dict[str, Any]]:
     """
     Função principal: Orquestra a extração de tabelas de CALENDÁRIO.
     Esta é a função que o 'table_runner.py' irá chamar.
+    Com context (DocumentContext do table_runner), usa as tabelas já extraídas em lote.
     """
     print(f"--- [calendar.py] Processando Página {page_num} ---")
     
     # 1. Extrai tabelas da página
-    raw_tables = get_raw_tables_from_page(pdf_path, page_num)
+    raw_tables = context.tables(page_num) if context else get_raw_tables_from_page(pdf_path, page_num)
     
     if not raw_tables:
         print(f"  [calendar.py] Nenhuma tabela encontrada por Camelot na página {page_num}.")
@@ -1,13 +1,14 @@
-import fitz  # PyMuPDF
 import re
+import numpy as np
 import pandas as pd
+from functools import lru_cache
 from typing import Dict, Optional, List, Any
 
 # --- IMPORTAÇÃO CHAVE (MODIFICADA) ---
 # Em vez de ter a função aqui, importamos da nossa "caixa de ferramentas"
 # O '..' significa 'subir um nível' (de 'processors' para 'table_pipeline')
-# e então acessar o 'extractor.py'
-from ..extractor import get_raw_tables_from_page
+# e então acessar o 'context.py' (texto e tabelas da página, via 'extractor.py')
+from ..context import DocumentContext
 
 # --- Funções "Privadas" de Processamento (Helpers) ---
 # (Todo o seu código original, inalterado)
@@ -28,10 +29,9 @@ def _get_default_room(salas_info_text: Optional[str]) -> Optional[str]:
         else:
             return None
 
-def _extract_horario_metadata(page: fitz.Page) -> Dict[str, Optional[str]]:
+def _extract_horario_metadata(text: str) -> Dict[str, Optional[str]]:
     """Extrai metadados (Semestre, Curso/Turma, Sala) do texto de uma página de horário."""
     metadata = {"semestre": None, "turma": None, "salas_info": None}
-    text = page.get_text("text")
     lines = text.split('\n')
 
     semestre_pattern = re.compile(r"^\s*\d+/\d{4}\s*$")
@@ -53,63 +53,95 @@ def _extract_horario_metadata(page: fitz.Page) -> Dict[str, Optional[str]]:
             break
     return metadata
 
-def _parse_cell_content(cell_text: str) -> Dict[str, Optional[str]]:
-    """Extrai Disciplina, Professor e Sala de uma célula da tabela de horário."""
-    aula = {"disciplina": None, "professor": None, "sala": None}
-    if pd.isna(cell_text) or not str(cell_text).strip():
-        return aula
-
-    text = ' '.join(str(cell_text).strip().split())
+# --- Padrões (compilados uma vez por módulo)
+_DIAS_SEMANA_KEYWORDS = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta"]
+_DIAS_SEMANA_PATTERN = re.compile("|".join(_DIAS_SEMANA_KEYWORDS))
+_PROFESSOR_PATTERN = re.compile(r"\(([^)]+)\)")
+
+# Padrões de sala em ordem de prioridade: vale o primeiro cuja última ocorrência termina no
+# fim do texto (no máximo 1 caractere depois). Fundidos numa regex só: cada ramo da alternância
+# ancorada em ^ é testado por inteiro antes do próximo (a prioridade), e o (.*) guloso acha a
+# última ocorrência; o grupo 1 é a disciplina e o grupo 2, a sala.
+_SALA_PATTERNS_ORDERED = [
+    r"P\d\s*[-–—]?\s*Sala\s*\d+",
+    r"LabCC\s*[-–—]?\s*P\d",
+    r"LabRedes\s*[-–—]?\s*P\d",
+    r"Sala\s*\d+",
+    r"LabCC",
+    r"LabRedes",
+]
+_SALA_PATTERN = re.compile(
+    "^(?:" + "|".join(f"(.*)({pattern}).?$" for pattern in _SALA_PATTERNS_ORDERED) + ")",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_CELL_KEYS = ("disciplina", "professor", "sala")
+_EMPTY_CELL = (None, None, None)
+
+@lru_cache(maxsize=4096)
+def _parse_cell_text(cell_text: str) -> tuple:
+    """
+    (disciplina, professor, sala) do texto de uma célula.
+    Memoizada: com o ffill das colunas de dia, a mesma célula se repete em várias linhas
+    (e as mesmas aulas, em várias turmas).
+    """
+    text = ' '.join(cell_text.strip().split())
     professor = None
     sala = None
     disciplina = text
 
     # 1. Extrai Professor
-    prof_match = re.search(r"\(([^)]+)\)", disciplina)
+    prof_match = _PROFESSOR_PATTERN.search(disciplina)
     if prof_match:
         professor = prof_match.group(1).strip()
         disciplina = (disciplina[:prof_match.start()] + disciplina[prof_match.end():]).strip()
 
     # 2. Extrai Sala
-    sala_patterns_ordered = [
-        r"(?i)(P\d\s*[-–—]?\s*Sala\s*\d+)",
-        r"(?i)(LabCC\s*[-–—]?\s*P\d)",
-        r"(?i)(LabRedes\s*[-–—]?\s*P\d)",
-        r"(?i)(Sala\s*\d+)",
-        r"(?i)(LabCC)",
-        r"(?i)(LabRedes)"
-    ]
-    
-    for pattern in sala_patterns_ordered:
-        matches = list(re.finditer(pattern, disciplina))
-        if matches:
-            last_match = matches[-1]
-            if last_match.end() >= len(disciplina) - 1:
-                sala = ' '.join(last_match.group(1).split())
-                disciplina = disciplina[:last_match.start()].strip()
-                break
+    sala_match = _SALA_PATTERN.match(disciplina)
+    if sala_match:
+        groups = sala_match.groups()
+        branch = next(i for i in range(0, len(groups), 2) if groups[i + 1] is not None)
+        sala = ' '.join(groups[branch + 1].split())
+        disciplina = groups[branch].strip()
 
     # 3. Limpeza final
     disciplina = disciplina.strip(' -')
-    aula["disciplina"] = disciplina if disciplina else None
-    aula["professor"] = professor
-    aula["sala"] = sala
-    return aula
+    return (disciplina if disciplina else None, professor, sala)
+
+def _parse_cell_content(cell_text: str) -> Dict[str, Optional[str]]:
+    """Extrai Disciplina, Professor e Sala de uma célula da tabela de horário."""
+    if pd.isna(cell_text):
+        return dict(zip(_CELL_KEYS, _EMPTY_CELL))
+    return dict(zip(_CELL_KEYS, _parse_cell_text(str(cell_text))))
 
-def _process_horario_df(raw_df: pd.DataFrame) -> Optional[pd.DataFrame]:
-    """Limpa, estrutura e parseia um DataFrame bruto de horário."""
+def _parse_day_column(column: pd.Series, default_room: Optional[str] = None) -> np.ndarray:
+    """
+    _parse_cell_content numa coluna de dia inteira, como matriz (n, 3) de
+    (disciplina, professor, sala). Com default_room, as aulas sem sala recebem a sala
+    padrão (máscara sobre a coluna de salas, em vez de um laço sobre os dicts).
+    """
+    parts = np.array([_EMPTY_CELL if pd.isna(cell) else _parse_cell_text(str(cell))
+                      for cell in column.to_numpy(dtype=object)], dtype=object).reshape(-1, 3)
+    if default_room:
+        disciplinas, salas = parts[:, 0], parts[:, 2]
+        parts[pd.isna(salas) & disciplinas.astype(bool), 2] = default_room
+    return parts
+
+def _process_horario_df(raw_df: pd.DataFrame, default_room: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Limpa, estrutura e parseia um DataFrame bruto de horário.
+    Com default_room, as aulas sem sala na célula recebem essa sala.
+    """
     if raw_df.empty:
         return None
 
     df = raw_df.copy()
     df.replace(r'^\s*$', pd.NA, regex=True, inplace=True)
 
-    # --- Identificação do Cabeçalho
+    # --- Identificação do Cabeçalho: primeira linha com um dia da semana em alguma célula
     header_row_index = -1
-    dias_semana_keywords = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta"]
-    for i, row in df.iterrows():
-        row_str = ' '.join(row.dropna().astype(str))
-        if any(dia in row_str for dia in dias_semana_keywords):
+    for i, row in enumerate(df.to_numpy(dtype=object)):
+        if any(isinstance(cell, str) and _DIAS_SEMANA_PATTERN.search(cell) for cell in row):
             header_row_index = i
             break
 
@@ -129,55 +161,52 @@ def _process_horario_df(raw_df: pd.DataFrame) -> Optional[pd.DataFrame]:
         df.rename(columns={df.columns[0]: "HorarioInfo"}, inplace=True)
     df.dropna(axis=1, how='all', inplace=True)
 
-    day_columns = [col for col in df.columns if isinstance(col, str) and any(kw in col for kw in dias_semana_keywords)]
-    
-    df[day_columns] = df[day_columns].ffill()
-    df.dropna(subset=day_columns, how='all', inplace=True)
+    day_columns = [col for col in df.columns if isinstance(col, str) and any(kw in col for kw in _DIAS_SEMANA_KEYWORDS)]
 
-    # --- Parseamento
+    # --- Parseamento (cada coluna de dia com ffill, as células vazias herdam a aula de cima)
+    has_aula = np.zeros(len(df), dtype=bool)
     for day_col in day_columns:
         if day_col in df.columns:
-            df[day_col] = df[day_col].apply(_parse_cell_content)
+            parts = _parse_day_column(df[day_col].ffill(), default_room)
+            has_aula |= parts[:, 0].astype(bool)
+            df[day_col] = pd.Series([dict(zip(_CELL_KEYS, aula)) for aula in parts], index=df.index, dtype=object)
 
-    # --- Limpeza Final
-    def check_row_fully_parsed_empty(row):
-        for day in day_columns:
-            if day in row.index and isinstance(row[day], dict) and row[day].get("disciplina"):
-                return False
-        return True
-    df = df[~df.apply(check_row_fully_parsed_empty, axis=1)]
+    # --- Limpeza Final: remove as linhas sem nenhuma disciplina (inclusive as com todos os dias vazios)
+    df = df[has_aula]
 
     return df.reset_index(drop=True)
 
 
 # --- Função "Pública" (Ponto de Entrada para este módulo) ---
 
-def extract_schedule_from_page(pdf_path: str, page_num: int) -> Optional[Dict[str, Any]]:
+def extract_schedule_from_page(pdf_path: str, page_num: int, context: DocumentContext = None) -> Optional[Dict[str, Any]]:
     """
     Função principal: Orquestra a extração de metadados e tabelas de UMA página.
     Esta é a função que o 'table_runner.py' irá chamar.
+    Com context (DocumentContext do table_runner), usa o texto e as tabelas já extraídos,
+    sem abrir o PDF de novo.
     """
     print(f"--- [horario.py] Processando Página {page_num} ---")
-    doc = None
+    own_context = context is None
+    if own_context:
+        context = DocumentContext(pdf_path)
     metadata = {}
     try:
-        doc = fitz.open(pdf_path)
-        if page_num < 1 or page_num > len(doc):
+        if page_num < 1 or page_num > context.page_count:
             print(f"Erro [horario.py]: Número da página {page_num} inválido.")
             return None
-        page = doc.load_page(page_num - 1)
-        metadata = _extract_horario_metadata(page)
+        metadata = _extract_horario_metadata(context.page_text(page_num))
         print(f"  [horario.py] Metadados encontrados: {metadata.get('turma')}")
     except Exception as e:
         print(f"Erro [horario.py] ao extrair metadados da página {page_num}: {e}")
-        if doc: doc.close()
         return None
     finally:
-        if doc: doc.close()
+        if own_context:
+            context.close()
 
     # --- MODIFICAÇÃO ---
     # Chama a função do 'extractor.py' em vez de tê-la aqui
-    raw_tables = get_raw_tables_from_page(pdf_path, page_num)
+    raw_tables = context.tables(page_num)
 
     if not raw_tables:
         print(f"  [horario.py] Nenhuma tabela encontrada por Camelot na página {page_num}.")
@@ -186,7 +215,8 @@ def extract_schedule_from_page(pdf_path: str, page_num: int) -> Optional[Dict[st
     if len(raw_tables) > 1:
         print(f"  Alerta [horario.py]: Múltiplas tabelas ({len(raw_tables)}) encontradas. Processando a primeira.")
 
-    processed_df = _process_horario_df(raw_tables[0])
+    default_room = _get_default_room(metadata.get("salas_info"))
+    processed_df = _process_horario_df(raw_tables[0], default_room)
 
     if processed_df is not None and not processed_df.empty:
         # --- Limpeza dos nomes das colunas
@@ -201,14 +231,9 @@ def extract_schedule_from_page(pdf_path: str, page_num: int) -> Optional[Dict[st
 
         horario_dict = processed_df.to_dict(orient='records')
 
-        # --- Lógica para preencher salas vazias
-        default_room = _get_default_room(metadata.get("salas_info"))
+        # --- Salas vazias já preenchidas com a sala padrão em _process_horario_df
         if default_room:
             print(f"  [horario.py] Sala padrão detectada: '{default_room}'")
-            for row_dict in horario_dict:
-                for key, value in row_dict.items():
-                    if isinstance(value, dict) and value.get("disciplina") and value.get("sala") is None:
-                        value["sala"] = default_room
         
         print(f"  [horario.py] Tabela da página {page_num} processada com sucesso.")
         return {
@@ -1,10 +1,12 @@
 # table_pipeline/processors/ppc.py
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List
 import re
 
 # IMPORT CORRIGIDO: Puxa da nossa "caixa de ferramentas"
 from ..extractor import get_raw_tables_from_page
+from ..context import DocumentContext
 
 # --- Funções Auxiliares de Limpeza (COM AS CORREÇÕES) ---
 
@@ -13,12 +15,29 @@ def _clean_string(text: Any) -> Optional[str]:
     if text is None or pd.isna(text):
         return None
         
-    cleaned = str(text).replace('\n', ' ').strip()
-    cleaned = ' '.join(cleaned.split()) # Remove espaços duplicados
+    cleaned = ' '.join(str(text).split()) # Troca quebras de linha e remove espaços duplicados
     
     # CORREÇÃO: Se a string estiver vazia (""), retorne "", não None.
     return cleaned 
 
+# _clean_string elemento a elemento sobre uma matriz object do NumPy (uma passada só, sem apply por coluna)
+_clean_cells = np.frompyfunc(_clean_string, 1, 1)
+
+def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """DataFrame com _clean_string aplicada a todas as células (mesmos índice e colunas)."""
+    values = _clean_cells(df.to_numpy(dtype=object))
+    # Uma coluna por vez: o pandas infere o dtype de cada uma como o apply inferiria
+    cleaned = pd.DataFrame({i: values[:, i] for i in range(values.shape[1])}, index=df.index)
+    cleaned.columns = df.columns
+    return cleaned
+
+def _find_row(cleaned_values: np.ndarray, keyword: str) -> int:
+    """Posição da primeira célula (já limpa) que contém keyword em maiúsculas, ou -1 (None nunca contém)."""
+    if len(cleaned_values) == 0:
+        return -1
+    found = (np.char.find(np.char.upper(cleaned_values.astype(str)), keyword) >= 0) & pd.notna(cleaned_values)
+    return int(found.argmax()) if found.any() else -1
+
 def _get_raw_table_text(raw_df: pd.DataFrame) -> str:
     """Retorna o texto bruto de um DataFrame, garantindo que seja sempre uma string."""
     if raw_df is None or raw_df.empty:
@@ -38,23 +57,17 @@ def _get_raw_table_text(raw_df: pd.DataFrame) -> str:
 def _parse_matriz_curricular(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
 
     df = raw_df.copy()
+    # As buscas usam a primeira coluna já limpa
+    first_column = _clean_cells(df.iloc[:, 0].to_numpy(dtype=object))
     
     # 1. Encontrar o Título do Período (ex: "1° PERÍODO")
     periodo_title = None
-    for i, row in df.iterrows():
-        cell_value = _clean_string(row.iloc[0])
-        # (Adicionado 'cell_value is not None' por segurança após a correção)
-        if cell_value is not None and "PERÍODO" in cell_value.upper():
-            periodo_title = cell_value
-            break
+    periodo_row_index = _find_row(first_column, "PERÍODO")
+    if periodo_row_index != -1:
+        periodo_title = first_column[periodo_row_index]
             
     # 2. Encontrar a Linha de Cabeçalho ("DISCIPLINA")
-    header_row_index = -1
-    for i, row in df.iterrows():
-        cell_value_0 = _clean_string(row.iloc[0])
-        if cell_value_0 is not None and "DISCIPLINA" in cell_value_0.upper():
-            header_row_index = i
-            break
+    header_row_index = _find_row(first_column, "DISCIPLINA")
             
     if header_row_index == -1:
         print("      [ppc.py] Alerta: _parse_matriz_curricular não encontrou 'DISCIPLINA'.")
@@ -89,8 +102,7 @@ def _parse_matriz_curricular(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     # 5. Limpar os Dados
     data_df = data_df[data_df['DISCIPLINA'].astype(str).str.contains('TOTAL', case=False, na=False) == False]
     
-    for col in data_df.columns:
-        data_df[col] = data_df[col].apply(_clean_string)
+    data_df = _clean_frame(data_df)
         
     data_df.dropna(how='all', inplace=True)
 
@@ -111,13 +123,8 @@ def _parse_optativas(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
 
     df = raw_df.copy()
 
-    # 1. Tentar Encontrar a Linha de Cabeçalho ("DISCIPLINA")
-    header_row_index = -1
-    for i, row in df.iterrows():
-        cell_value = _clean_string(row.iloc[0])
-        if cell_value is not None and "DISCIPLINA" in cell_value.upper():
-            header_row_index = i
-            break
+    # 1. Tentar Encontrar a Linha de Cabeçalho ("DISCIPLINA"), na primeira coluna já limpa
+    header_row_index = _find_row(_clean_cells(df.iloc[:, 0].to_numpy(dtype=object)), "DISCIPLINA")
             
     # 2. Definir o Início dos Dados
     data_start_index = 0
@@ -152,8 +159,7 @@ def _parse_optativas(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
     # 4. Limpar os Dados
     data_df['DISCIPLINA'] = data_df['DISCIPLINA'].ffill()
 
-    for col in data_df.columns:
-        data_df[col] = data_df[col].apply(_clean_string)
+    data_df = _clean_frame(data_df)
         
     data_df.dropna(how='all', inplace=True)
     data_df.dropna(subset=['CH_Semanal_Total'], inplace=True)
@@ -185,9 +191,10 @@ def _parse_docentes(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
 
     df = raw_df.copy()
     
+    # Cabeçalho: busca no texto bruto de cada linha (células unidas por espaço)
     header_row_index = -1
-    for i, row in df.iterrows():
-        row_str = ' '.join(row.dropna().astype(str)).lower()
+    for i, row in enumerate(df.to_numpy(dtype=object)):
+        row_str = ' '.join(str(cell) for cell in row if not pd.isna(cell)).lower()
         if "nome do professor" in row_str and "regime de trabalho" in row_str:
             header_row_index = i
             break
@@ -210,8 +217,7 @@ def _parse_docentes(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         df = df.iloc[:, :4]
         df.columns = expected_columns
     
-    for col in df.columns:
-        df[col] = df[col].apply(_clean_string)
+    df = _clean_frame(df)
         
     df.dropna(how='all', inplace=True)
 
@@ -297,14 +303,15 @@ def _parse_ementario(raw_df: pd.DataFrame) -> Optional[Dict[str, Any]]:
 
 # --- Função PÚBLICA (com DEBUG) ---
 
-def parse_ppc_page(pdf_path: str, page_num: int) -> Dict[str, Any]:
+def parse_ppc_page(pdf_path: str, page_num: int, context: DocumentContext = None) -> Dict[str, Any]:
     """
     Função principal do parser de PPC. (Versão com DEBUG ADICIONADO)
     Extrai TODAS as tabelas e roteia CADA UMA para o parser correto.
+    Com context (DocumentContext do table_runner), usa as tabelas já extraídas em lote.
     """
     
     # 1. Extrai TODAS as tabelas brutas da página
-    raw_tables = get_raw_tables_from_page(pdf_path, page_num)
+    raw_tables = context.tables(page_num) if context else get_raw_tables_from_page(pdf_path, page_num)
     
     parsed_data_list = [] 
     raw_table_list = []   
@@ -1,16 +1,122 @@
 # table_pipeline/table_runner.py
-import fitz
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, List
 
 # Nossos módulos
 from .identifier import identify_page_type
+from .context import DocumentContext
 from .processors.horario import extract_schedule_from_page
 from .processors.ppc import parse_ppc_page
 from .processors.calendar import process_calendar_page
 
-def run_extraction_pipeline(pdf_path: str) -> Dict[str, List[Any]]:
+# Tipos de página cujos processadores usam as tabelas do Camelot
+TABLE_PAGE_TYPES = ("horario", "ppc", "calendar")
+
+def _run_processor(pdf_path: str, page_num: int, page_type: str, context: DocumentContext) -> Any:
+    """Roda o processador do tipo da página e retorna o resultado dele (None se não houver)."""
+    if page_type == "horario":
+        return extract_schedule_from_page(pdf_path, page_num, context=context)
+    elif page_type == "ppc":
+        print(f"    -> Chamando processador 'ppc.py'...")
+        return parse_ppc_page(pdf_path, page_num, context=context)
+    elif page_type == "calendar":
+        return process_calendar_page(pdf_path, page_num, context=context)
+    elif page_type == "history_log":
+        # (Ainda para implementar)
+        pass
+    return None
+
+def _collect_result(results: Dict[str, List[Any]], page_type: str, data: Any) -> None:
+    """Adiciona o resultado de uma página à lista do seu tipo (chamada na ordem das páginas)."""
+    if page_type == "horario":
+        if data:
+            results["horarios"].append(data)
+
+    # --- MUDANÇA 2: Debug detalhado do PPC ---
+    elif page_type == "ppc":
+        ppc_data = data
+        if ppc_data and ppc_data.get("parsed_data_list"):
+            # SUCESSO!
+            num_tabelas = len(ppc_data['parsed_data_list'])
+            print(f"    -> SUCESSO: 'ppc.py' retornou {num_tabelas} tabela(s). Adicionando aos resultados.")
+            results["ppc_data"].append(ppc_data)
+        else:
+            print(f"    -> ALERTA: 'ppc.py' foi chamado, mas não retornou nenhuma tabela ('parsed_data_list' está vazia).")
+
+            if ppc_data and "summary" in ppc_data:
+                 print(f"    -> Sumário do 'ppc.py': {ppc_data['summary']}")
+    # --- FIM DA MUDANÇA 2 ---
+
+    elif page_type == "calendar":
+        if data:
+            results["calendarios"].append(data)
+
+def _process_page_in_worker(args: tuple) -> tuple:
+    """
+    Executado no pool: roda o processador de uma página capturando o que ele imprime.
+    Retorna (resultado, log, erro); o erro volta como texto, então uma página que falha
+    não derruba as demais.
+    """
+    pdf_path, page_num, page_type, context = args
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            return _run_processor(pdf_path, page_num, page_type, context), log.getvalue(), None
+        except Exception as e:
+            return None, log.getvalue(), str(e)
+
+class _IsolatedPageRunner:
+    """
+    Refaz, uma por vez, as páginas perdidas quando o pool principal quebra: cada página vai
+    para um pool novo de 1 processo, então a página que derruba o worker (ex: falta de
+    memória) só derruba esse processo, nunca o principal. Ela é pulada com o erro
+    registrado e o pool é recriado para as páginas seguintes.
+    """
+
+    def __init__(self, pdf_path: str, context: DocumentContext):
+        self.pdf_path = pdf_path
+        self.context = context
+        self._executor = None
+
+    def run(self, page_num: int, page_type: str) -> tuple:
+        """(resultado, log, erro) da página, como _process_page_in_worker."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        future = self._executor.submit(
+            _process_page_in_worker, (self.pdf_path, page_num, page_type, self.context.subset([page_num]))
+        )
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            self.close()
+            return None, "", f"o worker foi encerrado ao processar esta página, que foi pulada ({e})"
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+def run_extraction_pipeline(pdf_path: str, workers: int = 1, cache_dir: str = None) -> Dict[str, List[Any]]:
     """
     Ponto de entrada ÚNICO para o módulo de tabelas.
+    Classifica todas as páginas primeiro e extrai as tabelas de todas as que precisam
+    delas numa única chamada ao Camelot (CamelotSession); depois roda os processadores.
+    O PDF é aberto uma vez e o texto de cada página extraído uma vez: tudo fica num
+    DocumentContext entregue a todos os processadores.
+
+    Com workers > 1, os processadores (horario, ppc, calendar) rodam num pool de processos,
+    cada página recebendo só as suas tabelas. O log de cada página é impresso de uma vez e
+    os resultados entram em "results" na ordem das páginas; um erro numa página continua
+    afetando só ela. Se um worker morrer (o que quebra o pool todo), as páginas pendentes
+    são refeitas uma a uma em pools novos (_IsolatedPageRunner): a página que derrubou o
+    worker é pulada com o erro registrado e as demais são recuperadas, sem rodar nenhuma
+    delas no processo principal.
+
+    cache_dir (opcional) é o diretório do cache de tabelas do Camelot (ver
+    camelot_pool.read_tables), o mesmo usado por extract_tables; sem ele, nada é gravado.
     """
     results = {
         "horarios": [],
@@ -22,59 +128,77 @@ def run_extraction_pipeline(pdf_path: str) -> Dict[str, List[Any]]:
     
     print(f"Iniciando [Table Pipeline] para: {pdf_path}")
     
-    try:
-        doc = fitz.open(pdf_path)
-    except Exception as e:
-        print(f"Erro [Table Pipeline]: Não foi possível abrir o PDF {pdf_path}: {e}")
-        return results
-
-    for page_index in range(len(doc)):
-        page_num = page_index + 1
-        page = doc.load_page(page_index)
-        
-        page_type = identify_page_type(page)
+    # O documento é fechado ao sair do bloco, inclusive em caso de erro
+    with DocumentContext(pdf_path, cache_dir=cache_dir) as context:
+        try:
+            n_pages = context.page_count
+        except Exception as e:
+            print(f"Erro [Table Pipeline]: Não foi possível abrir o PDF {pdf_path}: {e}")
+            return results
 
-        print(f"  [Table Pipeline] Página {page_num}/{len(doc)} -> Tipo: {page_type}")
-        
-        if page_type == "unknown":
-            continue
+        # 1ª passada (barata): só o texto de cada página (guardado no contexto), para classificá-la;
+        # nenhum objeto de página fica carregado aqui
+        page_types = []
+        classify_stats = {}
+        for page_num in range(1, n_pages + 1):
+            page_type = identify_page_type(stats=classify_stats, text=context.page_text(page_num), page_num=page_num)
+
+            print(f"  [Table Pipeline] Página {page_num}/{n_pages} -> Tipo: {page_type}")
         
+            if page_type != "unknown":
+                page_types.append((page_num, page_type))
+        if classify_stats:
+            total_ms = sum(classify_stats["page_seconds"].values()) * 1000
+            print(f"  [Table Pipeline] Classificação: {total_ms:.1f}ms ({total_ms / len(classify_stats['page_seconds']):.2f}ms/pág) | "
+                  f"tipos: {classify_stats['type_hits']}")
 
-        try:
-            if page_type == "horario":
-                horario_data = extract_schedule_from_page(pdf_path, page_num)
-                if horario_data:
-                    results["horarios"].append(horario_data)
-            
-            # --- MUDANÇA 2: Debug detalhado do PPC ---
-            elif page_type == "ppc":
-                print(f"    -> Chamando processador 'ppc.py'...")
-                ppc_data = parse_ppc_page(pdf_path, page_num)
-                
-                if ppc_data and ppc_data.get("parsed_data_list"):
-                    # SUCESSO!
-                    num_tabelas = len(ppc_data['parsed_data_list'])
-                    print(f"    -> SUCESSO: 'ppc.py' retornou {num_tabelas} tabela(s). Adicionando aos resultados.")
-                    results["ppc_data"].append(ppc_data)
-                else:
-                    print(f"    -> ALERTA: 'ppc.py' foi chamado, mas não retornou nenhuma tabela ('parsed_data_list' está vazia).")
-                    
-                    if ppc_data and "summary" in ppc_data:
-                         print(f"    -> Sumário do 'ppc.py': {ppc_data['summary']}")
-            # --- FIM DA MUDANÇA 2 ---
-            
-            elif page_type == "calendar":
-                cal_data = process_calendar_page(pdf_path, page_num)
-                if cal_data:
-                    results["calendarios"].append(cal_data)
-            
-            elif page_type == "history_log":
-                # (Ainda para implementar)
-                pass 
-                
-        except Exception as e:
-            print(f"      ERRO [Table Pipeline] ao processar Página {page_num} (Tipo: {page_type}): {e}")
+        # Uma chamada ao Camelot para todas as páginas com tabelas
+        table_pages = [page_num for page_num, page_type in page_types if page_type in TABLE_PAGE_TYPES]
+        if table_pages:
+            print(f"  [Table Pipeline] Extraindo tabelas de {len(table_pages)} páginas em lote...")
+            context.extract_tables(table_pages)
+
+        # 2ª passada: processadores. Os resultados entram em "results" sempre na ordem das páginas
+        if workers <= 1:
+            for page_num, page_type in page_types:
+                try:
+                    data = _run_processor(pdf_path, page_num, page_type, context)
+                    _collect_result(results, page_type, data)
+                except Exception as e:
+                    print(f"      ERRO [Table Pipeline] ao processar Página {page_num} (Tipo: {page_type}): {e}")
+        else:
+            print(f"  [Table Pipeline] Processando {len(page_types)} páginas com {workers} processos...")
+            retry_runner = _IsolatedPageRunner(pdf_path, context)
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(_process_page_in_worker, (pdf_path, page_num, page_type, context.subset([page_num])))
+                        for page_num, page_type in page_types
+                    ]
+                    pool_broken = False
+                    for (page_num, page_type), future in zip(page_types, futures):
+                        try:
+                            data, log, error = future.result()
+                        except BrokenProcessPool as e:
+                            # Um worker morreu (ex: falta de memória) e o pool inteiro é descartado: as
+                            # páginas não concluídas são refeitas uma a uma, em pools isolados e na mesma ordem
+                            if not pool_broken:
+                                pool_broken = True
+                                print(f"  ⚠️ [Table Pipeline] Pool de processos interrompido ({e}). "
+                                      f"Refazendo as páginas pendentes, uma a uma, em processos isolados...")
+                            data, log, error = retry_runner.run(page_num, page_type)
+                        except Exception as e:
+                            data, log, error = None, "", str(e)
+                        print(log, end="")
+                        if error is not None:
+                            print(f"      ERRO [Table Pipeline] ao processar Página {page_num} (Tipo: {page_type}): {error}")
+                            continue
+                        try:
+                            _collect_result(results, page_type, data)
+                        except Exception as e:
+                            print(f"      ERRO [Table Pipeline] ao processar Página {page_num} (Tipo: {page_type}): {e}")
+            finally:
+                retry_runner.close()
 
-    doc.close()
     print(f"Concluído [Table Pipeline]. Resultados: { {k: len(v) for k, v in results.items() if v} }")
     return results
\ No newline at end of file